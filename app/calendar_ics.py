@@ -5,10 +5,18 @@ This module provides ICS file generation with support for the new
 schema including food items and confidence scoring.
 """
 import datetime
-from typing import List
+from functools import lru_cache
+from typing import List, Optional
 from schema import ParsedEvent
 
 
+@lru_cache(maxsize=64)
+def _get_timezone(name: str):
+    """Look up a pytz timezone once per name (events nearly all share one)."""
+    import pytz
+    return pytz.timezone(name)
+
+
 class ICSGenerator:
     """Generate ICS calendar files from ParsedEvent objects."""
     
@@ -31,20 +39,23 @@ class ICSGenerator:
             "METHOD:PUBLISH"
         ]
         
+        # One DTSTAMP for the whole file rather than a clock read per event
+        dtstamp = datetime.datetime.now(datetime.timezone.utc).strftime('%Y%m%dT%H%M%SZ')
         for event in events:
-            ics_content.extend(ICSGenerator._event_to_ics(event))
+            ics_content.extend(ICSGenerator._event_to_ics(event, dtstamp))
         
         ics_content.append("END:VCALENDAR")
         
         return "\r\n".join(ics_content)
     
     @staticmethod
-    def _event_to_ics(event: ParsedEvent) -> List[str]:
+    def _event_to_ics(event: ParsedEvent, dtstamp: Optional[str] = None) -> List[str]:
         """
         Convert a single ParsedEvent to ICS format.
         
         Args:
             event: ParsedEvent object
+            dtstamp: Preformatted DTSTAMP value (defaults to now)
             
         Returns:
             List of ICS lines for the event
@@ -56,8 +67,9 @@ class ICSGenerator:
         lines.append(f"UID:{uid}")
         
         # Add timestamp
-        now = datetime.datetime.now(datetime.timezone.utc)
-        lines.append(f"DTSTAMP:{now.strftime('%Y%m%dT%H%M%SZ')}")
+        if dtstamp is None:
+            dtstamp = datetime.datetime.now(datetime.timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+        lines.append(f"DTSTAMP:{dtstamp}")
         
         # Add event date/time
         start_dt = ICSGenerator._parse_datetime(event.date_start, event.time_start, event.timezone)
@@ -178,9 +190,7 @@ class ICSGenerator:
             dt = datetime.datetime(year, month, day, hour, minute)
             
             # Apply timezone
-            import pytz
-            tz = pytz.timezone(timezone)
-            dt = tz.localize(dt)
+            dt = _get_timezone(timezone).localize(dt)
             
             return dt
             
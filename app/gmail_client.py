@@ -10,8 +10,11 @@ This module provides Gmail API integration with:
 import os
 import base64
 import json
-from typing import List, Dict, Any, Optional
+import time
+from typing import List, Dict, Any, Optional, Iterator
+import httplib2
 from google.auth.transport.requests import Request
+from google_auth_httplib2 import AuthorizedHttp
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
@@ -25,6 +28,39 @@ logger = logging.getLogger(__name__)
 # Gmail API scopes
 SCOPES = ['https://www.googleapis.com/auth/gmail.readonly']
 
+# Socket timeout (seconds) for the shared Gmail HTTP connection
+HTTP_TIMEOUT = 10
+
+# Largest page messages.list will return
+MAX_PAGE_SIZE = 500
+
+# messages.get calls per batch HTTP request (Gmail rate-limits batches above 50)
+BATCH_SIZE = 50
+
+# Retries for messages a batch reports as rate-limited or failed server-side,
+# waiting RETRY_BASE_DELAY seconds before the first and doubling each time
+MAX_BATCH_RETRIES = 4
+RETRY_BASE_DELAY = 1.0
+
+# Per-request failures worth retrying: rate limits (429, or 403 with a
+# rate-limit reason) and transient server errors
+RETRYABLE_STATUSES = frozenset((429, 500, 502, 503, 504))
+RATE_LIMIT_REASONS = frozenset(('rateLimitExceeded', 'userRateLimitExceeded'))
+
+# Seconds a fetched label listing is reused before asking Gmail again
+LABEL_CACHE_TTL = 300
+
+# Lowercased header names read from each message
+WANTED_HEADERS = frozenset(('subject', 'from', 'date', 'list-id'))
+
+# Partial responses: only the message fields _parse_message reads, with MIME
+# parts nested three deep (e.g. mixed > alternative > text/plain)
+_PART_FIELDS = "mimeType,body/data"
+MESSAGE_FIELDS = (
+    f"payload(headers(name,value),{_PART_FIELDS},"
+    f"parts({_PART_FIELDS},parts({_PART_FIELDS},parts({_PART_FIELDS}))))"
+)
+
 class GmailClient:
     """Gmail client with configurable queries and generic filtering."""
     
@@ -32,7 +68,10 @@ class GmailClient:
         self.credentials_file = credentials_file
         self.token_file = token_file
         self.service = None
+        self.http = None
         self.config = get_config()
+        self._labels = None
+        self._labels_fetched_at = 0.0
         self._authenticate()
 
     def _authenticate(self):
@@ -62,7 +101,10 @@ class GmailClient:
             with open(self.token_file, 'w') as token:
                 token.write(creds.to_json())
         
-        self.service = build('gmail', 'v1', credentials=creds)
+        # Build one authorized HTTP connection and pin it to the service so
+        # every API call reuses the same TLS session instead of reconnecting
+        self.http = AuthorizedHttp(creds, http=httplib2.Http(timeout=HTTP_TIMEOUT))
+        self.service = build('gmail', 'v1', http=self.http, cache_discovery=False)
 
     def search_emails(self, query: str, max_results: int = 10) -> List[str]:
         """
@@ -75,17 +117,38 @@ class GmailClient:
         Returns:
             List of message IDs
         """
-        try:
-            results = self.service.users().messages().list(
-                userId='me', q=query, maxResults=max_results
-            ).execute()
+        return list(self.iter_message_ids(query, max_results))
+
+    def iter_message_ids(self, query: str, max_results: int = 10) -> Iterator[str]:
+        """
+        Yield message IDs matching the query, following result pages as needed.
+        
+        Args:
+            query: Gmail search query string
+            max_results: Maximum number of IDs to yield
             
-            messages = results.get('messages', [])
-            return [msg['id'] for msg in messages]
+        Yields:
+            Message IDs, newest first
+        """
+        remaining = max_results
+        page_token = None
+        try:
+            while remaining > 0:
+                results = self.service.users().messages().list(
+                    userId='me', q=query, maxResults=min(remaining, MAX_PAGE_SIZE),
+                    pageToken=page_token, fields='messages/id,nextPageToken'
+                ).execute()
+                
+                messages = results.get('messages', [])[:remaining]
+                remaining -= len(messages)
+                yield from (msg['id'] for msg in messages)
+                
+                page_token = results.get('nextPageToken')
+                if not page_token:
+                    break
             
         except HttpError as error:
             logger.error(f"Error searching emails: {error}")
-            return []
 
     def get_email_content(self, message_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -99,51 +162,135 @@ class GmailClient:
         """
         try:
             message = self.service.users().messages().get(
-                userId='me', id=message_id, format='full'
+                userId='me', id=message_id, format='full', fields=MESSAGE_FIELDS
             ).execute()
-            
-            headers = message['payload'].get('headers', [])
-            subject = next((h['value'] for h in headers if h['name'] == 'Subject'), '')
-            sender = next((h['value'] for h in headers if h['name'] == 'From'), '')
-            date = next((h['value'] for h in headers if h['name'] == 'Date'), '')
-            list_id = next((h['value'] for h in headers if h['name'] == 'List-Id'), '')
-            
-            # Extract plain text body
-            body = self._extract_text_from_payload(message['payload'])
-            
-            return {
-                'message_id': message_id,
-                'subject': subject,
-                'sender': sender,
-                'date': date,
-                'body': body,
-                'list_id': list_id
-            }
+            return self._parse_message(message_id, message)
             
         except HttpError as error:
             logger.error(f"Error getting email content: {error}")
             return None
 
+    def get_emails_content(self, message_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Get email content for several message IDs, sending the requests in batches.
+        
+        Args:
+            message_ids: Gmail message IDs
+            
+        Returns:
+            Email dictionaries in input order, skipping messages that failed
+        """
+        # A batch rejects repeated request IDs
+        message_ids = list(dict.fromkeys(message_ids))
+        messages: Dict[str, Dict[str, Any]] = {}
+        retry_ids: List[str] = []
+        
+        def on_message(request_id: str, response: Dict[str, Any], exception: Optional[HttpError]):
+            if exception is None:
+                messages[request_id] = response
+            elif self._is_retryable(exception):
+                retry_ids.append(request_id)
+            else:
+                logger.error(f"Error getting email content for {request_id}: {exception}")
+        
+        pending = message_ids
+        for attempt in range(MAX_BATCH_RETRIES + 1):
+            if attempt:
+                delay = RETRY_BASE_DELAY * 2 ** (attempt - 1)
+                logger.warning(f"Retrying {len(pending)} throttled or failed messages in {delay:.0f}s")
+                time.sleep(delay)
+            retry_ids.clear()
+            
+            for start in range(0, len(pending), BATCH_SIZE):
+                chunk = pending[start:start + BATCH_SIZE]
+                batch = self.service.new_batch_http_request(callback=on_message)
+                for msg_id in chunk:
+                    batch.add(
+                        self.service.users().messages().get(
+                            userId='me', id=msg_id, format='full', fields=MESSAGE_FIELDS
+                        ),
+                        request_id=msg_id
+                    )
+                try:
+                    batch.execute()
+                except HttpError as error:
+                    if self._is_retryable(error):
+                        # Retry whatever the failed batch did not already deliver
+                        seen = set(retry_ids)
+                        retry_ids.extend(m for m in chunk if m not in messages and m not in seen)
+                    else:
+                        logger.error(f"Error getting email batch: {error}")
+            
+            if not retry_ids:
+                break
+            pending = list(retry_ids)
+        else:
+            logger.error(f"Giving up on {len(pending)} messages after {MAX_BATCH_RETRIES} retries")
+        
+        return [
+            self._parse_message(msg_id, messages[msg_id])
+            for msg_id in message_ids
+            if msg_id in messages
+        ]
+
+    @staticmethod
+    def _is_retryable(error: HttpError) -> bool:
+        """Whether a Gmail error is a rate limit or transient server failure."""
+        status = error.resp.status
+        if status in RETRYABLE_STATUSES:
+            return True
+        if status == 403:
+            details = error.error_details if isinstance(error.error_details, list) else []
+            return any(
+                isinstance(detail, dict) and detail.get('reason') in RATE_LIMIT_REASONS
+                for detail in details
+            )
+        return False
+
+    def _parse_message(self, message_id: str, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the email dictionary from a full-format Gmail message."""
+        # One pass over the headers, keeping the first value of each one we use
+        header_map = {}
+        for header in message['payload'].get('headers', []):
+            name = header['name'].lower()
+            if name in WANTED_HEADERS and name not in header_map:
+                header_map[name] = header['value']
+                if len(header_map) == len(WANTED_HEADERS):
+                    break
+        
+        # Extract plain text body
+        body = self._extract_text_from_payload(message['payload'])
+        
+        return {
+            'message_id': message_id,
+            'subject': header_map.get('subject', ''),
+            'sender': header_map.get('from', ''),
+            'date': header_map.get('date', ''),
+            'body': body,
+            'list_id': header_map.get('list-id', '')
+        }
+
     def _extract_text_from_payload(self, payload: Dict[str, Any]) -> str:
         """Extract plain text from email payload."""
-        body = ""
+        # Collect decoded parts and join once, rather than growing one string per part
+        texts = []
         
         if 'parts' in payload:
             for part in payload['parts']:
                 if part['mimeType'] == 'text/plain':
-                    data = part['body'].get('data')
+                    data = part.get('body', {}).get('data')
                     if data:
-                        body += base64.urlsafe_b64decode(data).decode('utf-8', errors='ignore')
+                        texts.append(base64.urlsafe_b64decode(data).decode('utf-8', errors='ignore'))
                 elif part['mimeType'] in ['multipart/alternative', 'multipart/related', 'multipart/mixed']:
                     # Recursively extract from multipart
-                    body += self._extract_text_from_payload(part)
+                    texts.append(self._extract_text_from_payload(part))
         else:
             if payload['mimeType'] == 'text/plain':
-                data = payload['body'].get('data')
+                data = payload.get('body', {}).get('data')
                 if data:
-                    body = base64.urlsafe_b64decode(data).decode('utf-8', errors='ignore')
+                    texts.append(base64.urlsafe_b64decode(data).decode('utf-8', errors='ignore'))
         
-        return body.strip()
+        return ''.join(texts).strip()
 
     def get_emails_for_parsing(self, query: str, max_results: int = 10) -> List[Dict[str, Any]]:
         """
@@ -157,13 +304,8 @@ class GmailClient:
             List of email dictionaries ready for parsing
         """
         message_ids = self.search_emails(query, max_results)
-        emails = []
-        
-        for msg_id in message_ids:
-            email_data = self.get_email_content(msg_id)
-            if email_data and email_data['body']:
-                emails.append(email_data)
-        
+        emails = [email_data for email_data in self.get_emails_content(message_ids) if email_data['body']]
+        logger.info("Fetched %d emails with text bodies from %d matches", len(emails), len(message_ids))
         return emails
 
     def get_events_emails(self, max_results: int = 50, custom_query: str = None) -> List[Dict[str, Any]]:
@@ -328,10 +470,15 @@ class GmailClient:
         Returns:
             List of label dictionaries
         """
+        # Labels rarely change, so reuse the last listing for a while
+        if self._labels is not None and time.monotonic() - self._labels_fetched_at < LABEL_CACHE_TTL:
+            return self._labels
+        
         try:
             results = self.service.users().labels().list(userId='me').execute()
-            labels = results.get('labels', [])
-            return labels
+            self._labels = results.get('labels', [])
+            self._labels_fetched_at = time.monotonic()
+            return self._labels
         except HttpError as error:
             logger.error(f"Error getting labels: {error}")
             return []
@@ -11,7 +11,7 @@ import os
 import json
 import logging
 import re
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Iterator
 from openai import OpenAI
 
 from config import get_config
@@ -21,6 +21,17 @@ from utils import norm_text
 
 logger = logging.getLogger(__name__)
 
+# Mailing list tag in a subject, e.g. "[cs-talks] Friday seminar"
+MAILING_LIST_RE = re.compile(r'\[([^\]]+)\]')
+
+
+def compile_keywords(keywords: List[str]) -> "re.Pattern[str]":
+    """Compile literal keywords into one alternation; an empty list never matches."""
+    if not keywords:
+        return re.compile(r'(?!)')
+    return re.compile("|".join(map(re.escape, keywords)))
+
+
 class LLMParser:
     """LLM parser with gating, caching, and learning capabilities."""
     
@@ -39,9 +50,22 @@ class LLMParser:
         )
         
         self.store = store or EventStore()
-        self.prompt_template = self._load_prompt_template()
+        # Categories and cuisines are fixed per config, so encode them into the template once
+        self.prompt_template = (
+            self._load_prompt_template()
+            .replace('{{CATEGORIES}}', json.dumps(self.config["categories"]))
+            .replace('{{CUISINES}}', json.dumps(self.config["cuisines"]))
+        )
         self.llm_calls_made = 0
         self.max_calls = self.config["max_llm_calls_per_run"]
+        # One compiled alternation instead of a re.search per configured pattern
+        self.time_pattern = re.compile(
+            "|".join(f"(?:{pattern})" for pattern in self.config["event_time_patterns"]),
+            re.IGNORECASE
+        )
+        # Substring keyword checks run as one scan of the (already normalized) text
+        self.event_keyword_re = compile_keywords(self.config["event_keyword_patterns"])
+        self.location_keyword_re = compile_keywords(self.config["location_keyword_patterns"])
         
     def _load_prompt_template(self) -> str:
         """Load the prompt template from file."""
@@ -71,40 +95,31 @@ class LLMParser:
         if len(content_normalized) < 100:
             return False
         
-        content_lower = norm_text(email_content)
         subject_lower = norm_text(subject or "")
         
-        # Check for event keywords in subject first (more reliable for mailing lists)
-        has_event_keywords_in_subject = any(keyword in subject_lower 
-                                           for keyword in self.config["event_keyword_patterns"])
-        has_event_keywords_in_content = any(keyword in content_lower 
-                                           for keyword in self.config["event_keyword_patterns"])
-        
-        # If subject has event keywords, be more lenient about body content
-        if has_event_keywords_in_subject:
+        # Check for event keywords in subject first (more reliable for mailing lists).
+        # Each check below settles the answer on its own, so later scans only run when needed.
+        if self.event_keyword_re.search(subject_lower):
             # Skip the mailing list footer check for event-like subjects
-            has_event_keywords = True
-        else:
-            # Check for mailing list footers (common non-event content)
-            if len(content_normalized) < 200 and "mailing list" in content_normalized:
-                return False
-            has_event_keywords = has_event_keywords_in_content
+            return True
         
-        # Check for time/date patterns
-        has_time_patterns = any(re.search(pattern, content_normalized, re.IGNORECASE) 
-                              for pattern in self.config["event_time_patterns"])
+        # Check for mailing list footers (common non-event content)
+        if len(content_normalized) < 200 and "mailing list" in content_normalized:
+            return False
         
-        # Check for location indicators
-        has_location = any(keyword in content_lower for keyword in self.config["location_keyword_patterns"])
+        if self.event_keyword_re.search(content_normalized):
+            return True
         
-        # Must have at least event keywords OR (time patterns AND location)
-        return has_event_keywords or (has_time_patterns and has_location)
+        # Otherwise need both a location indicator and a time/date pattern;
+        # the plain keyword scan is cheaper, so it goes first
+        return (
+            self.location_keyword_re.search(content_normalized) is not None
+            and self.time_pattern.search(content_normalized) is not None
+        )
 
     def _inject_prompt_variables(self, prompt: str, email_data: Dict[str, Any]) -> str:
         """Inject configuration variables into the prompt template."""
-        # Replace template variables
-        prompt = prompt.replace('{{CATEGORIES}}', json.dumps(self.config["categories"]))
-        prompt = prompt.replace('{{CUISINES}}', json.dumps(self.config["cuisines"]))
+        # Replace per-email template variables ({{CATEGORIES}}/{{CUISINES}} are filled at load)
         prompt = prompt.replace('{{EMAIL_PLAIN_TEXT}}', email_data.get('body', ''))
         prompt = prompt.replace('{{EMAIL_SUBJECT}}', email_data.get('subject', ''))
         prompt = prompt.replace('{{EMAIL_DATE}}', email_data.get('date', ''))
@@ -133,7 +148,7 @@ class LLMParser:
             
             # Gate: Check if email looks like an event
             if not self._is_event_like(email_content, subject):
-                logger.debug(f"Email gated out (not event-like): {subject}")
+                logger.debug("Email gated out (not event-like): %s", subject)
                 return None
             
             # Check cache
@@ -141,7 +156,7 @@ class LLMParser:
             cached_response = self.store.get_cached_response(cache_key)
             
             if cached_response:
-                logger.debug(f"Using cached response for: {subject}")
+                logger.debug("Using cached response for: %s", subject)
                 return self._process_llm_response(cached_response, message_id, subject)
             
             # Prepare email data for prompt
@@ -172,7 +187,7 @@ class LLMParser:
             
             # Check for DROP response
             if response_text.strip() == '"DROP"' or response_text.strip() == 'DROP':
-                logger.info(f"Email dropped (no event): {subject}")
+                logger.info("Email dropped (no event): %s", subject)
                 return None
             
             # Parse JSON
@@ -254,20 +269,20 @@ class LLMParser:
 
     def _extract_mailing_list_from_subject(self, subject: str) -> Optional[str]:
         """Extract mailing list name from [XXXXX] pattern in subject."""
-        match = re.search(r'\[([^\]]+)\]', subject)
+        match = MAILING_LIST_RE.search(subject)
         return match.group(1) if match else None
 
-    def parse_emails_batch(self, emails: List[Dict[str, Any]]) -> List[ParsedEvent]:
+    def iter_parse_emails(self, emails: List[Dict[str, Any]]) -> Iterator[ParsedEvent]:
         """
-        Parse multiple emails in batch with gating and caching.
+        Parse multiple emails lazily, yielding each event as soon as it is parsed.
         
         Args:
             emails: List of email dictionaries with 'body', 'message_id', 'subject'
             
-        Returns:
-            List of successfully parsed ParsedEvent objects
+        Yields:
+            Successfully parsed ParsedEvent objects
         """
-        parsed_events = []
+        parsed_count = 0
         self.llm_calls_made = 0  # Reset call counter
         
         logger.info(f"Starting batch parse of {len(emails)} emails (max {self.max_calls} LLM calls)")
@@ -286,10 +301,24 @@ class LLMParser:
             )
             
             if event:
-                parsed_events.append(event)
+                parsed_count += 1
+                yield event
+        
+        logger.info(f"Batch parse complete: {parsed_count} events parsed, {self.llm_calls_made} LLM calls made")
+
+    def parse_emails_batch(self, emails: List[Dict[str, Any]]) -> List[ParsedEvent]:
+        """
+        Parse multiple emails in batch with gating and caching.
         
-        logger.info(f"Batch parse complete: {len(parsed_events)} events parsed, {self.llm_calls_made} LLM calls made")
-        return parsed_events
+        Args:
+            emails: List of email dictionaries with 'body', 'message_id', 'subject'
+            
+        Returns:
+            List of successfully parsed ParsedEvent objects
+        """
+        # Cache writes for the whole batch reach disk in one journal write
+        with self.store.batch():
+            return list(self.iter_parse_emails(emails))
 
     def get_parsing_stats(self) -> Dict[str, Any]:
         """Get parsing statistics."""
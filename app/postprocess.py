@@ -7,9 +7,8 @@ This module handles:
 - Data normalization and validation
 - Integration with the learning store
 """
-import re
 import logging
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime
 
 from config import get_config
@@ -19,6 +18,55 @@ from utils import norm_text
 
 logger = logging.getLogger(__name__)
 
+# Punctuation folded to ASCII in titles, descriptions and locations (one str.translate pass)
+PUNCTUATION_MAP = str.maketrans({
+    "\u2013": "-",   # en dash
+    "\u2014": "-",   # em dash
+    "\u2018": "'",
+    "\u2019": "'",
+    "\u201c": '"',
+    "\u201d": '"',
+    "\u00a0": " ",   # non-breaking space
+})
+
+# Values the LLM uses when a field is unknown
+PLACEHOLDER_VALUES = frozenset({"", "TBD", "N/A", "-", "null", "NULL"})
+
+# UTF-8 punctuation that was decoded as cp1252 (e.g. "\u00e2\u20ac\u201c" for an en dash)
+MOJIBAKE_MAP = {
+    c.encode("utf-8").decode("cp1252", errors="replace").replace("\ufffd", "\x9d"): c
+    for c in "\u2013\u2014\u2018\u2019\u201c\u201d\u2026"
+}
+
+
+def repair_mojibake(text: str) -> str:
+    """Undo mis-decoded UTF-8 punctuation, leaving the rest of the text alone."""
+    if "\u00e2\u20ac" not in text:
+        return text
+    for garbled, char in MOJIBAKE_MAP.items():
+        text = text.replace(garbled, char)
+    return text
+
+
+# Query parameters dropped from event URLs
+TRACKING_PARAM_PREFIXES = ("utm_", "fbclid=", "gclid=", "ref=")
+
+def strip_tracking_params(url: str) -> str:
+    """Remove tracking query parameters; URLs without any are returned as-is."""
+    if "?" not in url:
+        return url
+    
+    head, _, tail = url.partition("?")
+    query, hash_mark, fragment = tail.partition("#")
+    params = query.split("&")
+    kept = [param for param in params if param and not param.startswith(TRACKING_PARAM_PREFIXES)]
+    if len(kept) == len(params):
+        return url
+    
+    if kept:
+        head += "?" + "&".join(kept)
+    return head + hash_mark + fragment
+
 class PostProcessor:
     """Post-processes parsed events with learning and confidence handling."""
     
@@ -67,10 +115,8 @@ class PostProcessor:
             parsed_data['urls'] = self._normalize_urls(parsed_data.get('urls', []))
         
         # Map placeholders to None
-        placeholders = {"", "TBD", "N/A", "-", "null", "NULL"}
-        
         for key in ['organizer', 'location', 'description']:
-            if key in parsed_data and parsed_data[key] in placeholders:
+            if key in parsed_data and parsed_data[key] in PLACEHOLDER_VALUES:
                 parsed_data[key] = None
         
         # Clean up contact information
@@ -78,17 +124,17 @@ class PostProcessor:
             for contact in parsed_data.get('contacts', []):
                 if isinstance(contact, dict):
                     for field in ['name', 'email']:
-                        if field in contact and contact[field] in placeholders:
+                        if field in contact and contact[field] in PLACEHOLDER_VALUES:
                             contact[field] = None
         
         # Strip exotic dashes and collapse whitespace
         for key in ['title', 'description', 'location']:
             if key in parsed_data and parsed_data[key]:
                 text = str(parsed_data[key])
-                # Replace fancy dashes
-                text = re.sub(r'[–—]', '-', text)
+                # Replace fancy dashes and quotes
+                text = repair_mojibake(text).translate(PUNCTUATION_MAP)
                 # Collapse repeated spaces
-                text = re.sub(r'\s+', ' ', text).strip()
+                text = ' '.join(text.split())
                 parsed_data[key] = text
         
         return parsed_data
@@ -101,7 +147,7 @@ class PostProcessor:
         if 'category' in data and data['category']:
             category_conf = confidence.get('category', 1.0)
             if category_conf < self.min_confidence['category']:
-                logger.debug(f"Category '{data['category']}' filtered out (conf: {category_conf:.3f})")
+                logger.debug("Category '%s' filtered out (conf: %.3f)", data['category'], category_conf)
                 data['category'] = None
         
         # Filter food items based on cuisine confidence
@@ -111,7 +157,7 @@ class PostProcessor:
                 if isinstance(item, dict):
                     cuisine_conf = item.get('confidence', {}).get('cuisine', 1.0)
                     if cuisine_conf < self.min_confidence['cuisine']:
-                        logger.debug(f"Cuisine '{item.get('cuisine')}' filtered out (conf: {cuisine_conf:.3f})")
+                        logger.debug("Cuisine '%s' filtered out (conf: %.3f)", item.get('cuisine'), cuisine_conf)
                         item['cuisine'] = None
                     filtered_food.append(item)
             data['food'] = filtered_food
@@ -123,6 +169,9 @@ class PostProcessor:
         if 'food' not in data or not isinstance(data['food'], list):
             return data
         
+        # Learned cuisines looked up so far in this event; an entry is dropped when its name is re-learned
+        learned_by_name: Dict[str, Optional[Tuple[str, float]]] = {}
+        
         processed_food = []
         for item_data in data['food']:
             if not isinstance(item_data, dict):
@@ -139,16 +188,20 @@ class PostProcessor:
             )
             
             # Check for learned cuisine
-            learned_cuisine = self.store.get_learned_cuisine(food_item.name)
+            if name in learned_by_name:
+                learned_cuisine = learned_by_name[name]
+            else:
+                learned_cuisine = learned_by_name[name] = self.store.get_learned_cuisine(name)
             if learned_cuisine and not food_item.cuisine:
                 # Use learned cuisine if no cuisine was detected
                 food_item.cuisine = learned_cuisine[0]
-                logger.debug(f"Using learned cuisine for '{food_item.name}': {learned_cuisine[0]}")
+                logger.debug("Using learned cuisine for '%s': %s", food_item.name, learned_cuisine[0])
             elif food_item.cuisine:
                 # Learn this mapping if confidence is high enough
                 confidence = item_data.get('confidence', {}).get('cuisine', 1.0)
                 if confidence >= self.min_confidence['cuisine']:
                     self.store.learn_cuisine(food_item.name, food_item.cuisine, confidence)
+                    learned_by_name.pop(name, None)
             
             processed_food.append(food_item)
         
@@ -173,10 +226,8 @@ class PostProcessor:
             
             # Basic validation - just check if it looks like a URL
             if '.' in url and len(url) > 3:
-                # Remove common tracking parameters
-                url = re.sub(r'[?&](utm_[^&]*|fbclid|gclid|ref)=[^&]*', '', url)
-                url = re.sub(r'[?&]$', '', url)  # Remove trailing ? or &
-                normalized.append(url)
+                # Remove common tracking parameters and any trailing ? or &
+                normalized.append(strip_tracking_params(url))
         
         return normalized
 
@@ -198,31 +249,41 @@ class PostProcessor:
 
     def process_events_batch(self, events_data: List[Dict[str, Any]]) -> List[ParsedEvent]:
         """Process a batch of events with deduplication."""
-        processed_events = []
-        seen_events = set()
-        
-        for event_data in events_data:
-            # Check for duplicates
-            event_id = f"{event_data.get('title', '')}_{event_data.get('date_start', '')}_{event_data.get('time_start', '')}"
-            if event_id in seen_events:
-                continue
+        # Learned aliases and dedup registrations are written once for the batch
+        with self.store.batch():
+            processed_events = []
+            seen_events = set()
+            
+            candidates = []
             
-            # Process the event
-            event = self.process_event(event_data)
-            if event:
-                # Check for duplicate in store
-                duplicate_id = self.store.is_duplicate_event(event.model_dump())
+            for event_data in events_data:
+                # Check for duplicates
+                event_id = f"{event_data.get('title', '')}_{event_data.get('date_start', '')}_{event_data.get('time_start', '')}"
+                if event_id in seen_events:
+                    continue
+                
+                # Process the event
+                event = self.process_event(event_data)
+                if event:
+                    candidates.append((event_id, event))
+                    seen_events.add(event_id)
+            
+            # Check the whole batch for duplicates in store
+            checked = self.store.filter_duplicates(
+                [event.model_dump() for _, event in candidates],
+                [event_id for event_id, _ in candidates]
+            )
+            for (event_id, event), (event_dump, duplicate_id) in zip(candidates, checked):
                 if duplicate_id:
-                    logger.debug(f"Duplicate event detected: {event.title}")
+                    logger.debug("Duplicate event detected: %s", event.title)
                     # Could merge with existing event here
                     continue
                 
                 # Register event for future deduplication
-                self.store.register_event(event_id, event.model_dump())
+                self.store.register_event(event_id, event_dump)
                 processed_events.append(event)
-                seen_events.add(event_id)
-        
-        return processed_events
+            
+            return processed_events
     
     def get_learning_stats(self) -> Dict[str, Any]:
         """Get statistics about learned aliases and processing."""
@@ -234,7 +295,7 @@ class PostProcessor:
         low_conf_count = 0
         
         for alias_data in self.store.data["learned_aliases"].values():
-            conf = alias_data.get("rolling_confidence", 0.0)
+            conf = alias_data.rolling_confidence
             if conf >= 0.8:
                 high_conf_count += 1
             elif conf >= 0.6:
@@ -8,12 +8,21 @@ from pydantic import BaseModel, Field, HttpUrl, field_validator
 from typing import Optional, List, Dict, Any
 from enum import Enum
 import re
+import sys
 
 from config import get_config
 
 # Get configuration
 config = get_config()
 
+# Frozen lookup sets for validator membership checks
+VALID_CATEGORIES = frozenset(config["categories"])
+VALID_CUISINES = frozenset(config["cuisines"])
+
+# Field formats checked on every validated event, compiled once
+DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+TIME_RE = re.compile(r"\d{2}:\d{2}")
+
 # Note: Categories and cuisines are now validated against config lists
 # instead of using dynamic enums to avoid import issues
 
@@ -34,7 +43,7 @@ class FoodItem(BaseModel):
         if v is None:
             return v
         # Check if cuisine is in configured list
-        if v not in config["cuisines"]:
+        if v not in VALID_CUISINES:
             return None  # Invalid cuisine, set to None
         return v
 
@@ -84,7 +93,7 @@ class ParsedEvent(BaseModel):
         """Validate date format."""
         if v is None:
             return v
-        if not re.fullmatch(r"\d{4}-\d{2}-\d{2}", v):
+        if not DATE_RE.fullmatch(v):
             raise ValueError("date_start must be YYYY-MM-DD")
         return v
 
@@ -94,7 +103,7 @@ class ParsedEvent(BaseModel):
         """Validate time format."""
         if v is None:
             return v
-        if not re.fullmatch(r"\d{2}:\d{2}", v):
+        if not TIME_RE.fullmatch(v):
             raise ValueError("time must be HH:MM 24h")
         return v
 
@@ -104,9 +113,17 @@ class ParsedEvent(BaseModel):
         """Validate category against configuration."""
         if v is None:
             return v
-        if v not in config["categories"]:
+        if v not in VALID_CATEGORIES:
             return None  # Invalid category, set to None
-        return v
+        return sys.intern(v)
+
+    @field_validator("timezone", "mailing_list")
+    @classmethod
+    def intern_repeated_values(cls, v: Optional[str]) -> Optional[str]:
+        """Share one string object per timezone/mailing list across events."""
+        if v is None:
+            return v
+        return sys.intern(v)
 
     def get_primary_cuisine(self) -> Optional[str]:
         """Get the most common cuisine from food items."""
@@ -207,5 +224,15 @@ class ParsedEvent(BaseModel):
         
         return cls(**legacy_data)
 
+    @classmethod
+    def from_trusted_dump(cls, data: Dict[str, Any]) -> "ParsedEvent":
+        """Rebuild an event from this model's own model_dump() output without re-validating it."""
+        fields = dict(data)
+        fields["contacts"] = [Contact.model_construct(**c) for c in data.get("contacts") or []]
+        fields["food"] = [FoodItem.model_construct(**f) for f in data.get("food") or []]
+        if data.get("confidence") is not None:
+            fields["confidence"] = ConfidenceScores.model_construct(**data["confidence"])
+        return cls.model_construct(**fields)
+
 # Backward compatibility aliases
 Event = ParsedEvent  # For existing code
@@ -8,13 +8,21 @@ This module provides:
 - Backward compatibility
 """
 import os
+import re
 import sys
-from typing import List, Optional, Dict, Any
+import gzip
+import hmac
+import hashlib
+import secrets
+from functools import lru_cache
+from typing import List, Optional, Dict, Any, Iterable
 from fastapi import FastAPI, HTTPException, Request, Query
-from fastapi.responses import HTMLResponse, Response
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import HTMLResponse, Response, StreamingResponse, ORJSONResponse
 from fastapi.templating import Jinja2Templates
 from dotenv import load_dotenv
 import logging
+import orjson
 
 # Add app to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -44,19 +52,113 @@ app = FastAPI(
     version="2.0.0"
 )
 
+# Compress JSON/HTML responses; small payloads are sent as-is
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=4)
+
 # Initialize components
 gmail_client = None
 llm_parser = None
 post_processor = None
 event_store = None
 config = None
+gg_events_query = None
+
+# Fixed Gmail queries compared by /debug/query
+DEBUG_QUERIES = {
+    "gg_events": "label:GG.Events newer_than:14d",
+    "hcs_discuss": "list:hcs-discuss newer_than:14d",
+    "pfoho_open": "list:pfoho-open newer_than:14d",
+    "event_keywords": "subject:event OR subject:meeting OR subject:workshop newer_than:14d",
+    "broad_inbox": "in:inbox newer_than:7d"
+}
+BROAD_INBOX_QUERY = DEBUG_QUERIES["broad_inbox"]
+
+# Placeholder signing keys published in docs/examples; a server must never run with one
+PLACEHOLDER_SIGNING_KEYS = frozenset({"change-me"})
+
+def load_signing_key() -> bytes:
+    """Read EVENT_SIGNING_KEY, refusing a published placeholder (per-process random key unless set)."""
+    key = os.getenv('EVENT_SIGNING_KEY', '').strip()
+    if key in PLACEHOLDER_SIGNING_KEYS:
+        raise RuntimeError(
+            "EVENT_SIGNING_KEY is set to a placeholder; generate one with "
+            "python -c \"import secrets; print(secrets.token_hex(32))\""
+        )
+    return key.encode() or secrets.token_bytes(32)
+
+# Key for signing event payloads served by /events/*, so /ics can trust a
+# resubmitted event without re-running validation
+EVENT_SIGNING_KEY = load_signing_key()
+
+# Recently generated ICS files, keyed by event signature
+ICS_CACHE_SIZE = 128
+ics_cache: Dict[str, str] = {}
+
+@lru_cache(maxsize=256)
+def norm_cuisine(cuisine: Optional[str]) -> str:
+    """Normalize a cuisine label; cuisines come from a small closed set, so results are memoized."""
+    return norm_text(cuisine)
+
+def matches_filters(event: ParsedEvent, category: Optional[str], want_cuisine: Optional[str]) -> bool:
+    """Check an event against the category filter and a pre-normalized cuisine filter."""
+    if category and event.category != category:
+        return False
+    if want_cuisine:
+        return any(norm_cuisine(item.cuisine) == want_cuisine for item in event.food if item.cuisine)
+    return True
+
+def sign_event(event_dict: Dict[str, Any]) -> str:
+    """Compute the HMAC signature of a served event dictionary."""
+    payload = orjson.dumps(event_dict, option=orjson.OPT_SORT_KEYS)
+    return hmac.new(EVENT_SIGNING_KEY, payload, hashlib.sha256).hexdigest()
+
+def stream_events(
+    meta: Dict[str, Any],
+    events: Iterable[ParsedEvent],
+    category: Optional[str],
+    want_cuisine: Optional[str],
+    llm: LLMParser,
+    bodies_by_id: Optional[Dict[str, str]] = None
+) -> StreamingResponse:
+    """
+    Stream filtered events as ND-JSON, one line per event as soon as it is parsed.
+    
+    The first line is a {"type": "meta"} record, each event is sent as
+    {"type": "event", "event": {...}}, and a final {"type": "stats"} record
+    closes the stream. Events are emitted in parse order.
+    """
+    def generate():
+        yield orjson.dumps({"type": "meta", **meta}) + b"\n"
+        try:
+            for event in events:
+                if not matches_filters(event, category, want_cuisine):
+                    continue
+                event_dict = event.model_dump()
+                if bodies_by_id is not None:
+                    event_dict['original_email_body'] = bodies_by_id.get(
+                        event_dict['source_message_id'], 'Email content not available'
+                    )
+                event_dict['__validated__'] = sign_event(event_dict)
+                yield orjson.dumps({"type": "event", "event": event_dict}) + b"\n"
+            yield orjson.dumps({"type": "stats", "stats": llm.get_parsing_stats()}) + b"\n"
+        except Exception as e:
+            logger.error(f"Error streaming events: {e}")
+            yield orjson.dumps({"type": "error", "detail": str(e)}) + b"\n"
+    
+    # Identity encoding keeps GZipMiddleware from buffering the stream
+    return StreamingResponse(
+        generate(),
+        media_type="application/x-ndjson",
+        headers={"Content-Encoding": "identity"}
+    )
 
 def get_components():
     """Get or initialize all components."""
-    global gmail_client, llm_parser, post_processor, event_store, config
+    global gmail_client, llm_parser, post_processor, event_store, config, gg_events_query
     
     if config is None:
         config = get_config()
+        gg_events_query = f"label:GG.Events newer_than:{config['event_window_days']}d"
     
     if event_store is None:
         try:
@@ -101,20 +203,26 @@ async def get_configuration():
     if not config:
         raise HTTPException(status_code=500, detail="Configuration not available")
     
-    return {
+    return config_response()
+
+@lru_cache(maxsize=1)
+def config_response() -> ORJSONResponse:
+    """Build the /config response once; configuration is static after startup."""
+    return ORJSONResponse({
         "categories": config["categories"],
         "cuisines": config["cuisines"],
         "event_window_days": config["event_window_days"],
         "max_llm_calls_per_run": config["max_llm_calls_per_run"],
         "min_confidence": config["min_confidence"]
-    }
+    })
 
 @app.get("/events/scan")
 async def scan_events(
     query: Optional[str] = None,
     max_results: int = 10,
     category: Optional[str] = None,
-    cuisine: Optional[str] = None
+    cuisine: Optional[str] = None,
+    stream: bool = False
 ):
     """
     Scan Gmail for events and return parsed results with filtering.
@@ -124,6 +232,7 @@ async def scan_events(
         max_results: Maximum number of emails to process
         category: Filter by event category
         cuisine: Filter by food cuisine
+        stream: Stream events as ND-JSON as they are parsed
         
     Returns:
         List of parsed events
@@ -147,30 +256,25 @@ async def scan_events(
         if not emails:
             return {"events": [], "message": "No emails found matching the query"}
         
+        want_cuisine = norm_cuisine(cuisine) if cuisine else None
+        
+        if stream:
+            meta = {"query": query, "filters": {"category": category, "cuisine": cuisine}}
+            return stream_events(meta, llm.iter_parse_emails(emails), category, want_cuisine, llm)
+        
         # Parse emails
         parsed_events = llm.parse_emails_batch(emails)
         
         # Events are already parsed and validated, no need for post-processing
         processed_events = parsed_events
         
-        # Apply filters
-        filtered_events = []
-        for event in processed_events:
-            # Category filter
-            if category and event.category != category:
-                continue
-            
-            # Cuisine filter
-            if cuisine:
-                want_cuisine = norm_text(cuisine)
-                event_cuisines = [norm_text(item.cuisine) for item in event.food if item.cuisine]
-                if want_cuisine not in event_cuisines:
-                    continue
-            
-            filtered_events.append(event)
-        
-        # Convert to dict for JSON response
-        events_data = [event.model_dump() for event in filtered_events]
+        # Apply filters and convert to dict for JSON response
+        events_data = [
+            event.model_dump() for event in processed_events
+            if matches_filters(event, category, want_cuisine)
+        ]
+        for event_dict in events_data:
+            event_dict['__validated__'] = sign_event(event_dict)
         
         return {
             "events": events_data,
@@ -192,7 +296,8 @@ async def scan_all_events(
     max_results: int = Query(50, ge=1, le=100, description="Maximum number of emails to process"),
     sort: str = Query("desc", description="Sort order - 'desc' for newest first, 'asc' for oldest first"),
     category: Optional[str] = Query(None, description="Filter by event category"),
-    cuisine: Optional[str] = Query(None, description="Filter by food cuisine")
+    cuisine: Optional[str] = Query(None, description="Filter by food cuisine"),
+    stream: bool = Query(False, description="Stream events as ND-JSON as they are parsed")
 ):
     """
     Scan Gmail for events from mailing lists only (GG.Events + other mailing lists).
@@ -202,6 +307,7 @@ async def scan_all_events(
         sort: Sort order - "desc" for newest first, "asc" for oldest first
         category: Filter by event category
         cuisine: Filter by food cuisine
+        stream: Stream events as ND-JSON as they are parsed (unsorted)
         
     Returns:
         List of parsed events from mailing lists only
@@ -221,36 +327,31 @@ async def scan_all_events(
         if not emails:
             return {"events": [], "message": "No mailing list emails found"}
         
+        want_cuisine = norm_cuisine(cuisine) if cuisine else None
+        bodies_by_id = {email['message_id']: email['body'] for email in emails}
+        
+        if stream:
+            meta = {"source": "Mailing Lists", "filters": {"category": category, "cuisine": cuisine}}
+            return stream_events(meta, llm.iter_parse_emails(emails), category, want_cuisine, llm, bodies_by_id)
+        
         # Parse emails
         parsed_events = llm.parse_emails_batch(emails)
         
         # Events are already parsed and validated, no need for post-processing
         processed_events = parsed_events
         
-        # Apply filters
-        filtered_events = []
-        for event in processed_events:
-            # Category filter
-            if category and event.category != category:
-                continue
-            
-            # Cuisine filter
-            if cuisine:
-                want_cuisine = norm_text(cuisine)
-                event_cuisines = [norm_text(item.cuisine) for item in event.food if item.cuisine]
-                if want_cuisine not in event_cuisines:
-                    continue
-            
-            # Add original email body for display
-            event.original_email_body = next(
-                (email['body'] for email in emails if email['message_id'] == event.source_message_id), 
-                'Email content not available'
-            )
-            
-            filtered_events.append(event)
+        # Apply filters and convert to dict for JSON response
+        events_data = [
+            event.model_dump() for event in processed_events
+            if matches_filters(event, category, want_cuisine)
+        ]
         
-        # Convert to dict for JSON response
-        events_data = [event.model_dump() for event in filtered_events]
+        # Add original email body for display
+        for event_dict in events_data:
+            event_dict['original_email_body'] = bodies_by_id.get(
+                event_dict['source_message_id'], 'Email content not available'
+            )
+            event_dict['__validated__'] = sign_event(event_dict)
         
         # Sort events by date_start, then by time_start
         def sort_key(event):
@@ -283,7 +384,8 @@ async def scan_gg_events(
     max_results: int = 50, 
     sort: str = "desc",
     category: Optional[str] = None,
-    cuisine: Optional[str] = None
+    cuisine: Optional[str] = None,
+    stream: bool = False
 ):
     """
     Scan GG.Events emails and return parsed results with filtering.
@@ -293,6 +395,7 @@ async def scan_gg_events(
         sort: Sort order - "desc" for newest first, "asc" for oldest first
         category: Filter by event category
         cuisine: Filter by food cuisine
+        stream: Stream events as ND-JSON as they are parsed (unsorted)
         
     Returns:
         List of parsed events from GG.Events
@@ -312,36 +415,31 @@ async def scan_gg_events(
         if not emails:
             return {"events": [], "message": "No GG.Events emails found"}
         
+        want_cuisine = norm_cuisine(cuisine) if cuisine else None
+        bodies_by_id = {email['message_id']: email['body'] for email in emails}
+        
+        if stream:
+            meta = {"source": "GG.Events", "filters": {"category": category, "cuisine": cuisine}}
+            return stream_events(meta, llm.iter_parse_emails(emails), category, want_cuisine, llm, bodies_by_id)
+        
         # Parse emails
         parsed_events = llm.parse_emails_batch(emails)
         
         # Events are already parsed and validated, no need for post-processing
         processed_events = parsed_events
         
-        # Apply filters
-        filtered_events = []
-        for event in processed_events:
-            # Category filter
-            if category and event.category != category:
-                continue
-            
-            # Cuisine filter
-            if cuisine:
-                want_cuisine = norm_text(cuisine)
-                event_cuisines = [norm_text(item.cuisine) for item in event.food if item.cuisine]
-                if want_cuisine not in event_cuisines:
-                    continue
-            
-            # Add original email body for display
-            event.original_email_body = next(
-                (email['body'] for email in emails if email['message_id'] == event.source_message_id), 
-                'Email content not available'
-            )
-            
-            filtered_events.append(event)
+        # Apply filters and convert to dict for JSON response
+        events_data = [
+            event.model_dump() for event in processed_events
+            if matches_filters(event, category, want_cuisine)
+        ]
         
-        # Convert to dict for JSON response
-        events_data = [event.model_dump() for event in filtered_events]
+        # Add original email body for display
+        for event_dict in events_data:
+            event_dict['original_email_body'] = bodies_by_id.get(
+                event_dict['source_message_id'], 'Email content not available'
+            )
+            event_dict['__validated__'] = sign_event(event_dict)
         
         # Sort events by date_start, then by time_start
         def sort_key(event):
@@ -381,16 +479,30 @@ async def generate_ics(event_data: dict):
         ICS file content
     """
     try:
-        # Convert to ParsedEvent
-        if "food" in event_data and isinstance(event_data["food"], list):
-            # New format
-            event = ParsedEvent(**event_data)
-        else:
-            # Legacy format
-            event = ParsedEvent.from_legacy_format(event_data)
+        # Events served by /events/* carry a signature and skip re-validation
+        signature = event_data.pop("__validated__", None)
+        trusted = isinstance(signature, str) and hmac.compare_digest(sign_event(event_data), signature)
         
-        # Generate ICS content
-        ics_content = ICSGenerator.generate_ics([event])
+        if trusted and signature in ics_cache:
+            ics_content = ics_cache[signature]
+        else:
+            # Convert to ParsedEvent
+            if trusted:
+                event = ParsedEvent.from_trusted_dump(event_data)
+            elif "food" in event_data and isinstance(event_data["food"], list):
+                # New format
+                event = ParsedEvent(**event_data)
+            else:
+                # Legacy format
+                event = ParsedEvent.from_legacy_format(event_data)
+            
+            # Generate ICS content
+            ics_content = ICSGenerator.generate_ics([event])
+            
+            if trusted:
+                if len(ics_cache) >= ICS_CACHE_SIZE:
+                    del ics_cache[next(iter(ics_cache))]
+                ics_cache[signature] = ics_content
         
         return Response(
             content=ics_content,
@@ -454,103 +566,106 @@ async def generate_ics_by_id(event_id: str):
         logger.error(f"Error generating ICS for event {event_id}: {e}")
         raise HTTPException(status_code=500, detail=f"Error generating ICS: {str(e)}")
 
-@app.get("/events/sample")
-async def get_sample_events():
-    """Get sample events for testing the UI."""
-    sample_events = [
-        {
-            "title": "AI Workshop: Machine Learning Fundamentals",
-            "description": "Learn the basics of machine learning with hands-on exercises and real-world examples.",
-            "date_start": "2025-01-15",
-            "time_start": "14:00",
-            "time_end": "16:00",
-            "location": "Science Center 101",
-            "organizer": "Harvard AI Society",
-            "category": "workshop",
-            "food": [
-                {
-                    "name": "Pizza",
-                    "quantity_hint": "dinner for first 30 attendees",
-                    "cuisine": "Italian"
-                },
-                {
-                    "name": "Coffee",
-                    "quantity_hint": "unlimited",
-                    "cuisine": "Other"
-                }
-            ],
-            "confidence": {
-                "category": 0.9,
-                "cuisine": 0.8,
-                "overall": 0.85
+# Static sample data for the UI demo, encoded once at import
+SAMPLE_EVENTS = [
+    {
+        "title": "AI Workshop: Machine Learning Fundamentals",
+        "description": "Learn the basics of machine learning with hands-on exercises and real-world examples.",
+        "date_start": "2025-01-15",
+        "time_start": "14:00",
+        "time_end": "16:00",
+        "location": "Science Center 101",
+        "organizer": "Harvard AI Society",
+        "category": "workshop",
+        "food": [
+            {
+                "name": "Pizza",
+                "quantity_hint": "dinner for first 30 attendees",
+                "cuisine": "Italian"
             },
-            "urls": ["https://harvard.edu/ai-workshop"],
-            "mailing_list": "GG.Events",
-            "source_subject": "[GG.Events] AI Workshop: Machine Learning Fundamentals"
+            {
+                "name": "Coffee",
+                "quantity_hint": "unlimited",
+                "cuisine": "Other"
+            }
+        ],
+        "confidence": {
+            "category": 0.9,
+            "cuisine": 0.8,
+            "overall": 0.85
         },
-        {
-            "title": "Sushi Night Social",
-            "description": "Join us for a fun evening of networking over delicious sushi and drinks.",
-            "date_start": "2025-01-16",
-            "time_start": "18:00",
-            "time_end": "21:00",
-            "location": "Student Center Dining Hall",
-            "organizer": "International Students Association",
-            "category": "social",
-            "food": [
-                {
-                    "name": "Sushi Platter",
-                    "quantity_hint": "dinner for ~50 people",
-                    "cuisine": "Japanese"
-                },
-                {
-                    "name": "Sake",
-                    "quantity_hint": "wine and beer available",
-                    "cuisine": "Japanese"
-                }
-            ],
-            "confidence": {
-                "category": 0.95,
-                "cuisine": 0.9,
-                "overall": 0.92
+        "urls": ["https://harvard.edu/ai-workshop"],
+        "mailing_list": "GG.Events",
+        "source_subject": "[GG.Events] AI Workshop: Machine Learning Fundamentals"
+    },
+    {
+        "title": "Sushi Night Social",
+        "description": "Join us for a fun evening of networking over delicious sushi and drinks.",
+        "date_start": "2025-01-16",
+        "time_start": "18:00",
+        "time_end": "21:00",
+        "location": "Student Center Dining Hall",
+        "organizer": "International Students Association",
+        "category": "social",
+        "food": [
+            {
+                "name": "Sushi Platter",
+                "quantity_hint": "dinner for ~50 people",
+                "cuisine": "Japanese"
             },
-            "urls": ["https://forms.gle/sushi-night"],
-            "mailing_list": "GG.Events",
-            "source_subject": "[GG.Events] Sushi Night Social - RSVP Required"
+            {
+                "name": "Sake",
+                "quantity_hint": "wine and beer available",
+                "cuisine": "Japanese"
+            }
+        ],
+        "confidence": {
+            "category": 0.95,
+            "cuisine": 0.9,
+            "overall": 0.92
         },
-        {
-            "title": "Research Seminar: Climate Change Solutions",
-            "description": "Dr. Smith presents latest research on renewable energy and climate adaptation strategies.",
-            "date_start": "2025-01-17",
-            "time_start": "15:30",
-            "time_end": "17:00",
-            "location": "Environmental Science Building, Room 200",
-            "organizer": "Environmental Studies Department",
-            "category": "seminar",
-            "food": [
-                {
-                    "name": "Light Refreshments",
-                    "quantity_hint": "coffee and pastries",
-                    "cuisine": "Other"
-                }
-            ],
-            "confidence": {
-                "category": 0.85,
-                "cuisine": 0.6,
-                "overall": 0.75
-            },
-            "urls": ["https://harvard.edu/climate-seminar"],
-            "mailing_list": "GG.Events",
-            "source_subject": "[GG.Events] Climate Change Research Seminar"
-        }
-    ]
-    
-    return {
-        "events": sample_events,
-        "count": len(sample_events),
-        "source": "Sample Data",
-        "message": "These are sample events to demonstrate the enhanced UI features"
+        "urls": ["https://forms.gle/sushi-night"],
+        "mailing_list": "GG.Events",
+        "source_subject": "[GG.Events] Sushi Night Social - RSVP Required"
+    },
+    {
+        "title": "Research Seminar: Climate Change Solutions",
+        "description": "Dr. Smith presents latest research on renewable energy and climate adaptation strategies.",
+        "date_start": "2025-01-17",
+        "time_start": "15:30",
+        "time_end": "17:00",
+        "location": "Environmental Science Building, Room 200",
+        "organizer": "Environmental Studies Department",
+        "category": "seminar",
+        "food": [
+            {
+                "name": "Light Refreshments",
+                "quantity_hint": "coffee and pastries",
+                "cuisine": "Other"
+            }
+        ],
+        "confidence": {
+            "category": 0.85,
+            "cuisine": 0.6,
+            "overall": 0.75
+        },
+        "urls": ["https://harvard.edu/climate-seminar"],
+        "mailing_list": "GG.Events",
+        "source_subject": "[GG.Events] Climate Change Research Seminar"
     }
+]
+
+SAMPLE_RESPONSE = ORJSONResponse({
+    "events": SAMPLE_EVENTS,
+    "count": len(SAMPLE_EVENTS),
+    "source": "Sample Data",
+    "message": "These are sample events to demonstrate the enhanced UI features"
+})
+
+@app.get("/events/sample")
+async def get_sample_events():
+    """Get sample events for testing the UI."""
+    return SAMPLE_RESPONSE
 
 @app.get("/debug/query")
 async def debug_query():
@@ -561,17 +676,8 @@ async def debug_query():
         if not gmail:
             return {"error": "Gmail client not available"}
         
-        # Test different queries
-        queries = {
-            "gg_events": "label:GG.Events newer_than:14d",
-            "hcs_discuss": "list:hcs-discuss newer_than:14d", 
-            "pfoho_open": "list:pfoho-open newer_than:14d",
-            "event_keywords": "subject:event OR subject:meeting OR subject:workshop newer_than:14d",
-            "broad_inbox": "in:inbox newer_than:7d"
-        }
-        
         results = {}
-        for name, query in queries.items():
+        for name, query in DEBUG_QUERIES.items():
             try:
                 emails = gmail.get_emails_for_parsing(query, 5)
                 results[name] = {
@@ -597,7 +703,7 @@ async def debug_gating():
             return {"error": "Gmail client not available"}
         
         # Get a few emails from different sources
-        emails = gmail.get_emails_for_parsing("in:inbox newer_than:7d", 5)
+        emails = gmail.get_emails_for_parsing(BROAD_INBOX_QUERY, 5)
         
         results = []
         for email in emails:
@@ -698,7 +804,6 @@ async def debug_gmail():
         
         # Test GG.Events query
         try:
-            gg_events_query = f"label:GG.Events newer_than:{config['event_window_days']}d"
             gg_events_result = gmail.service.users().messages().list(
                 userId='me', q=gg_events_query, maxResults=5
             ).execute()
@@ -708,9 +813,8 @@ async def debug_gmail():
         
         # Test broader query
         try:
-            broad_query = "in:inbox newer_than:7d"
             broad_result = gmail.service.users().messages().list(
-                userId='me', q=broad_query, maxResults=5
+                userId='me', q=BROAD_INBOX_QUERY, maxResults=5
             ).execute()
             broad_count = len(broad_result.get('messages', []))
         except Exception as e:
@@ -725,7 +829,7 @@ async def debug_gmail():
             "gg_events_query_count": gg_events_count,
             "broad_query_count": broad_count,
             "event_window_days": config['event_window_days'],
-            "gg_events_query": f"label:GG.Events newer_than:{config['event_window_days']}d"
+            "gg_events_query": gg_events_query
         }
         
     except Exception as e:
@@ -763,25 +867,46 @@ async def get_system_stats():
 async def index(request: Request):
     """Serve the main HTML page with enhanced v2.0 functionality."""
     try:
-        # Read the original UI file
-        ui_path = os.path.join(os.path.dirname(__file__), '..', 'src', 'views', 'index.html')
-        with open(ui_path, 'r') as f:
-            html_content = f.read()
-        
-        # Enhance the UI with v2.0 features
-        enhanced_html = enhance_ui_with_v2_features(html_content)
-        
-        return HTMLResponse(content=enhanced_html)
+        etag = enhanced_ui_etag()
+        headers = {"ETag": etag, "Vary": "Accept-Encoding"}
+        if etag in request.headers.get("if-none-match", ""):
+            return Response(status_code=304, headers=headers)
+        
+        # Pre-compressed body; the explicit encoding makes GZipMiddleware pass it through
+        if "gzip" in request.headers.get("accept-encoding", ""):
+            headers["Content-Encoding"] = "gzip"
+            return Response(content=enhanced_ui_gzip(), media_type="text/html", headers=headers)
+        return Response(content=enhanced_ui_bytes(), media_type="text/html", headers=headers)
     except Exception as e:
         logger.error(f"Error serving index page: {e}")
         return HTMLResponse(content="<h1>Email Event Parser v2.0</h1><p>Error loading page.</p>")
 
-def enhance_ui_with_v2_features(html_content):
-    """Enhance the original UI with v2.0 features."""
+@lru_cache(maxsize=1)
+def enhanced_ui_bytes() -> bytes:
+    """Read, enhance and encode the UI page once; later requests reuse the bytes."""
+    # Read the original UI file
+    ui_path = os.path.join(os.path.dirname(__file__), '..', 'src', 'views', 'index.html')
+    with open(ui_path, 'r') as f:
+        html_content = f.read()
+    
+    # Enhance the UI with v2.0 features
+    return enhance_ui_with_v2_features(html_content).encode("utf-8")
+
+@lru_cache(maxsize=1)
+def enhanced_ui_gzip() -> bytes:
+    """Gzip the UI page once so requests skip per-response compression."""
+    return gzip.compress(enhanced_ui_bytes(), compresslevel=9)
+
+@lru_cache(maxsize=1)
+def enhanced_ui_etag() -> str:
+    """Weak ETag for the UI page, shared by its plain and gzip encodings."""
+    return 'W/"' + hashlib.blake2b(enhanced_ui_bytes(), digest_size=8).hexdigest() + '"'
+
+# Patches applied to the v1 UI template: original snippet -> v2.0 replacement
+UI_PATCHES = {
     # Add category and cuisine filters
-    enhanced_html = html_content.replace(
-        '<div class="form-group">\n                    <label for="mailingListFilter">Filter by Mailing List:</label>\n                    <select id="mailingListFilter">\n                        <option value="">All Mailing Lists</option>\n                    </select>\n                </div>',
-        '''<div class="form-group">
+    '<div class="form-group">\n                    <label for="mailingListFilter">Filter by Mailing List:</label>\n                    <select id="mailingListFilter">\n                        <option value="">All Mailing Lists</option>\n                    </select>\n                </div>':
+    '''<div class="form-group">
                     <label for="mailingListFilter">Filter by Mailing List:</label>
                     <select id="mailingListFilter">
                         <option value="">All Mailing Lists</option>
@@ -800,21 +925,17 @@ def enhance_ui_with_v2_features(html_content):
                     <select id="cuisineFilter">
                         <option value="">All Cuisines</option>
                     </select>
-                </div>'''
-    )
+                </div>''',
     
     # Add confidence and learning indicators
-    enhanced_html = enhanced_html.replace(
-        '<div class="event-badges">',
-        '''<div class="event-badges">
+    '<div class="event-badges">':
+    '''<div class="event-badges">
                         ${event.category ? `<span class="badge badge-category">📋 ${event.category}</span>` : ''}
-                        ${event.confidence && event.confidence.overall ? `<span class="badge badge-confidence">🎯 ${Math.round(event.confidence.overall * 100)}%</span>` : ''}'''
-    )
+                        ${event.confidence && event.confidence.overall ? `<span class="badge badge-confidence">🎯 ${Math.round(event.confidence.overall * 100)}%</span>` : ''}''',
     
     # Add food breakdown display
-    enhanced_html = enhanced_html.replace(
-        'if (hasFood(event)) {\n                badges.push(\'<span class="badge badge-food">🍕 Food</span>\');\n            }',
-        '''if (hasFood(event)) {
+    'if (hasFood(event)) {\n                badges.push(\'<span class="badge badge-food">🍕 Food</span>\');\n            }':
+    '''if (hasFood(event)) {
                 badges.push('<span class="badge badge-food">🍕 Food</span>');
             }
             
@@ -825,13 +946,11 @@ def enhance_ui_with_v2_features(html_content):
                         badges.push(`<span class="badge badge-cuisine">🍽️ ${foodItem.cuisine}</span>`);
                     }
                 });
-            }'''
-    )
+            }''',
     
     # Add CSS for new badges
-    enhanced_html = enhanced_html.replace(
-        '.badge-url {\n            background: #fef3c7;\n            color: #92400e;\n        }',
-        '''.badge-url {
+    '.badge-url {\n            background: #fef3c7;\n            color: #92400e;\n        }':
+    '''.badge-url {
             background: #fef3c7;
             color: #92400e;
         }
@@ -849,13 +968,11 @@ def enhance_ui_with_v2_features(html_content):
         .badge-confidence {
             background: #f0f9ff;
             color: #0369a1;
-        }'''
-    )
+        }''',
     
     # Add loading progress indicator
-    enhanced_html = enhanced_html.replace(
-        'loadBtn.textContent = \'⏳ Loading...\';',
-        '''loadBtn.textContent = '⏳ Loading...';
+    'loadBtn.textContent = \'⏳ Loading...\';':
+    '''loadBtn.textContent = '⏳ Loading...';
             
             // Show progress indicator
             const progressDiv = document.createElement('div');
@@ -870,13 +987,11 @@ def enhance_ui_with_v2_features(html_content):
                 style.id = 'progressCSS';
                 style.textContent = '@keyframes progress { 0% { width: 0%; } 50% { width: 70%; } 100% { width: 100%; } }';
                 document.head.appendChild(style);
-            }'''
-    )
+            }''',
     
     # Update the loadEvents function to use v2.0 endpoints
-    enhanced_html = enhanced_html.replace(
-        'const response = await fetch(`/events/all?max_results=${maxResults}&sort=desc`);',
-        '''// Get filter values
+    'const response = await fetch(`/events/all?max_results=${maxResults}&sort=desc`);':
+    '''// Get filter values
                 const categoryFilter = document.getElementById('categoryFilter').value;
                 const cuisineFilter = document.getElementById('cuisineFilter').value;
                 
@@ -887,23 +1002,19 @@ def enhance_ui_with_v2_features(html_content):
                 if (categoryFilter) params.append('category', categoryFilter);
                 if (cuisineFilter) params.append('cuisine', cuisineFilter);
                 
-                const response = await fetch(`/events/all?${params}`);'''
-    )
+                const response = await fetch(`/events/all?${params}`);''',
     
     # Add function to load filter options
-    enhanced_html = enhanced_html.replace(
-        'document.addEventListener(\'DOMContentLoaded\', function() {\n            loadEvents();\n            setupEventListeners();\n        });',
-        '''document.addEventListener('DOMContentLoaded', function() {
+    'document.addEventListener(\'DOMContentLoaded\', function() {\n            loadEvents();\n            setupEventListeners();\n        });':
+    '''document.addEventListener('DOMContentLoaded', function() {
             loadFilterOptions();
             loadEvents();
             setupEventListeners();
-        });'''
-    )
+        });''',
     
     # Add loadFilterOptions function
-    enhanced_html = enhanced_html.replace(
-        'function setupEventListeners() {',
-        '''async function loadFilterOptions() {
+    'function setupEventListeners() {':
+    '''async function loadFilterOptions() {
             try {
                 const response = await fetch('/config');
                 const config = await response.json();
@@ -930,34 +1041,28 @@ def enhance_ui_with_v2_features(html_content):
             }
         }
         
-        function setupEventListeners() {'''
-    )
+        function setupEventListeners() {''',
     
     # Update event listeners to include new filters
-    enhanced_html = enhanced_html.replace(
-        'document.getElementById(\'dateFilter\').addEventListener(\'change\', applyFilters);\n            document.getElementById(\'mailingListFilter\').addEventListener(\'change\', applyFilters);',
-        '''document.getElementById('dateFilter').addEventListener('change', applyFilters);
+    'document.getElementById(\'dateFilter\').addEventListener(\'change\', applyFilters);\n            document.getElementById(\'mailingListFilter\').addEventListener(\'change\', applyFilters);':
+    '''document.getElementById('dateFilter').addEventListener('change', applyFilters);
             document.getElementById('mailingListFilter').addEventListener('change', applyFilters);
             document.getElementById('categoryFilter').addEventListener('change', applyFilters);
-            document.getElementById('cuisineFilter').addEventListener('change', applyFilters);'''
-    )
+            document.getElementById('cuisineFilter').addEventListener('change', applyFilters);''',
     
     # Update applyFilters to include new filters
-    enhanced_html = enhanced_html.replace(
-        'function applyFilters() {\n            const dateFilter = document.getElementById(\'dateFilter\').value;\n            const mailingListFilter = document.getElementById(\'mailingListFilter\').value;\n            \n            let filtered = allEvents;',
-        '''function applyFilters() {
+    'function applyFilters() {\n            const dateFilter = document.getElementById(\'dateFilter\').value;\n            const mailingListFilter = document.getElementById(\'mailingListFilter\').value;\n            \n            let filtered = allEvents;':
+    '''function applyFilters() {
             const dateFilter = document.getElementById('dateFilter').value;
             const mailingListFilter = document.getElementById('mailingListFilter').value;
             const categoryFilter = document.getElementById('categoryFilter').value;
             const cuisineFilter = document.getElementById('cuisineFilter').value;
             
-            let filtered = allEvents;'''
-    )
+            let filtered = allEvents;''',
     
     # Add new filter logic
-    enhanced_html = enhanced_html.replace(
-        '// Filter by food\n            if (foodFilterActive) {\n                filtered = filtered.filter(event => hasFood(event));\n            }',
-        '''// Filter by category
+    '// Filter by food\n            if (foodFilterActive) {\n                filtered = filtered.filter(event => hasFood(event));\n            }':
+    '''// Filter by category
             if (categoryFilter) {
                 filtered = filtered.filter(event => event.category === categoryFilter);
             }
@@ -975,13 +1080,11 @@ def enhance_ui_with_v2_features(html_content):
             // Filter by food
             if (foodFilterActive) {
                 filtered = filtered.filter(event => hasFood(event));
-            }'''
-    )
+            }''',
     
     # Update hasFood function to work with new food structure
-    enhanced_html = enhanced_html.replace(
-        'function hasFood(event) {\n            // Check food_type and food_quantity_hint\n            if (event.food_type || event.food_quantity_hint) {\n                return true;\n            }\n            \n            // Check description for food keywords\n            const foodKeywords = /(pizza|snack|snacks|food|lunch|dinner|breakfast|refreshments|cater(ed|ing)|bagels?|coffee|tea|chai|cookies?)/i;\n            return foodKeywords.test(event.description || \'\');\n        }',
-        '''function hasFood(event) {
+    'function hasFood(event) {\n            // Check food_type and food_quantity_hint\n            if (event.food_type || event.food_quantity_hint) {\n                return true;\n            }\n            \n            // Check description for food keywords\n            const foodKeywords = /(pizza|snack|snacks|food|lunch|dinner|breakfast|refreshments|cater(ed|ing)|bagels?|coffee|tea|chai|cookies?)/i;\n            return foodKeywords.test(event.description || \'\');\n        }':
+    '''function hasFood(event) {
             // Check new food structure
             if (event.food && event.food.length > 0) {
                 return true;
@@ -995,26 +1098,22 @@ def enhance_ui_with_v2_features(html_content):
             // Check description for food keywords
             const foodKeywords = /(pizza|snack|snacks|food|lunch|dinner|breakfast|refreshments|cater(ed|ing)|bagels?|coffee|tea|chai|cookies?)/i;
             return foodKeywords.test(event.description || '');
-        }'''
-    )
+        }''',
     
     # Update clearFilters to include new filters
-    enhanced_html = enhanced_html.replace(
-        'function clearFilters() {\n            document.getElementById(\'dateFilter\').value = \'\';\n            document.getElementById(\'mailingListFilter\').value = \'\';\n            foodFilterActive = false;\n            document.getElementById(\'foodBtn\').classList.remove(\'active\');\n            document.getElementById(\'foodBtn\').textContent = \'🍕 Food Only\';',
-        '''function clearFilters() {
+    'function clearFilters() {\n            document.getElementById(\'dateFilter\').value = \'\';\n            document.getElementById(\'mailingListFilter\').value = \'\';\n            foodFilterActive = false;\n            document.getElementById(\'foodBtn\').classList.remove(\'active\');\n            document.getElementById(\'foodBtn\').textContent = \'🍕 Food Only\';':
+    '''function clearFilters() {
             document.getElementById('dateFilter').value = '';
             document.getElementById('mailingListFilter').value = '';
             document.getElementById('categoryFilter').value = '';
             document.getElementById('cuisineFilter').value = '';
             foodFilterActive = false;
             document.getElementById('foodBtn').classList.remove('active');
-            document.getElementById('foodBtn').textContent = '🍕 Food Only';'''
-    )
+            document.getElementById('foodBtn').textContent = '🍕 Food Only';''',
     
     # Add food breakdown to event details
-    enhanced_html = enhanced_html.replace(
-        'if (event.mailing_list) {\n                details += `\n                    <div class="detail-item">\n                        <div class="detail-label">Mailing List:</div>\n                        <div class="detail-value">${event.mailing_list}</div>\n                    </div>\n                `;\n            }',
-        '''if (event.food && event.food.length > 0) {
+    'if (event.mailing_list) {\n                details += `\n                    <div class="detail-item">\n                        <div class="detail-label">Mailing List:</div>\n                        <div class="detail-value">${event.mailing_list}</div>\n                    </div>\n                `;\n            }':
+    '''if (event.food && event.food.length > 0) {
                 details += `
                     <div class="detail-item">
                         <div class="detail-label">Food Details:</div>
@@ -1038,13 +1137,11 @@ def enhance_ui_with_v2_features(html_content):
                         <div class="detail-value">${event.mailing_list}</div>
                     </div>
                 `;
-            }'''
-    )
+            }''',
     
     # Add confidence display
-    enhanced_html = enhanced_html.replace(
-        'if (event.source_subject) {\n                details += `\n                    <div class="detail-item">\n                        <div class="detail-label">Original Subject:</div>\n                        <div class="detail-value">${event.source_subject}</div>\n                    </div>\n                `;\n            }',
-        '''if (event.confidence) {
+    'if (event.source_subject) {\n                details += `\n                    <div class="detail-item">\n                        <div class="detail-label">Original Subject:</div>\n                        <div class="detail-value">${event.source_subject}</div>\n                    </div>\n                `;\n            }':
+    '''if (event.confidence) {
                 const confDetails = [];
                 if (event.confidence.category !== null) confDetails.push(`Category: ${Math.round(event.confidence.category * 100)}%`);
                 if (event.confidence.cuisine !== null) confDetails.push(`Cuisine: ${Math.round(event.confidence.cuisine * 100)}%`);
@@ -1067,13 +1164,11 @@ def enhance_ui_with_v2_features(html_content):
                         <div class="detail-value">${event.source_subject}</div>
                     </div>
                 `;
-            }'''
-    )
+            }''',
     
     # Clean up progress indicator
-    enhanced_html = enhanced_html.replace(
-        '} finally {\n                loadBtn.disabled = false;\n                loadBtn.textContent = \'🔄 Load Events\';\n            }',
-        '''} finally {
+    '} finally {\n                loadBtn.disabled = false;\n                loadBtn.textContent = \'🔄 Load Events\';\n            }':
+    '''} finally {
                 loadBtn.disabled = false;
                 loadBtn.textContent = '🔄 Load Events';
                 
@@ -1082,10 +1177,14 @@ def enhance_ui_with_v2_features(html_content):
                 if (progressIndicator) {
                     progressIndicator.remove();
                 }
-            }'''
-    )
-    
-    return enhanced_html
+            }''',
+}
+UI_PATCH_PATTERN = re.compile("|".join(re.escape(snippet) for snippet in UI_PATCHES))
+
+def enhance_ui_with_v2_features(html_content):
+    """Enhance the original UI with v2.0 features."""
+    # Apply every patch in a single pass over the template
+    return UI_PATCH_PATTERN.sub(lambda match: UI_PATCHES[match.group(0)], html_content)
 
 @app.get("/debug/email/{message_id}")
 async def debug_single_email(message_id: str):
@@ -1138,4 +1237,4 @@ async def debug_single_email(message_id: str):
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8080, reload=True)
+    uvicorn.run("server:app", host="0.0.0.0", port=8080, loop="uvloop", http="httptools", reload=True)
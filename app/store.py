@@ -6,63 +6,378 @@ This module provides persistent storage for:
 - LLM response caching
 - Event deduplication tracking
 """
-import json
-import hashlib
+import os
+import sys
+import time
+import heapq
+import atexit
 import logging
+import threading
+import orjson
+import xxhash
 from typing import Dict, Any, Optional, List, Tuple
 from pathlib import Path
+from contextlib import contextmanager
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from difflib import SequenceMatcher
+from rapidfuzz import fuzz, process, utils as fuzz_utils
 
 from config import get_config
-from utils import norm_text, event_dedupe_key
+from utils import normalize_food_name, event_dedupe_fields, event_dedupe_fields_batch, hash_dedupe_fields, hash_dedupe_fields_batch
 
 logger = logging.getLogger(__name__)
 
+# Pretty-print the snapshot only when debugging
+SNAPSHOT_OPTIONS = orjson.OPT_INDENT_2 if os.getenv("LOG_LEVEL", "").upper() == "DEBUG" else 0
+
+@dataclass(slots=True)
+class AliasRec:
+    """Learned food name -> cuisine mapping."""
+    last_cuisine: str
+    rolling_confidence: float = 0.0
+    sample_count: int = 0
+    last_updated: float = 0.0
+
+@dataclass(slots=True)
+class CacheRec:
+    """Cached LLM response with the epoch second it was cached."""
+    response: Dict[str, Any]
+    timestamp: float
+
+@dataclass(slots=True)
+class DedupRec:
+    """Pre-parsed dedup entry, so fuzzy matching never re-splits or re-normalizes."""
+    event_id: str
+    norm_title: str
+    date: str
+    time: str
+    location: str
+    title_tokens_sorted: str
+    
+    @classmethod
+    def from_fields(cls, event_id: str, stored_key: str) -> Optional["DedupRec"]:
+        """Build a record from a stored "title|date|time|location" string."""
+        parts = stored_key.rsplit("|", 3)
+        if len(parts) < 4:
+            return None
+        norm_title, date, time_start, location = parts
+        return cls(
+            event_id=event_id,
+            norm_title=norm_title,
+            date=date,
+            time=time_start,
+            location=location,
+            title_tokens_sorted=" ".join(sorted(norm_title.split()))
+        )
+
 class EventStore:
-    """Persistent store for learned data and caches."""
+    """Persistent store for learned data and caches.
+    
+    The store is a JSON snapshot plus an append-only journal of mutations
+    (one JSON record per line). Mutators only buffer a journal record, which
+    a background timer writes out within FLUSH_INTERVAL seconds; the
+    snapshot is rewritten by compact(), which runs every COMPACT_EVERY
+    journal writes, on cleanup, and at interpreter exit.
+    
+    Fuzzy duplicate checks only compare events that share a date bucket
+    (±1 day) and a title block, via the in-memory _by_date/_by_token indices.
+    """
+    
+    # Journal records written before the snapshot is compacted
+    COMPACT_EVERY = 500
+    
+    # Seconds buffered journal records may wait before being written to disk
+    FLUSH_INTERVAL = 5.0
+    
+    # Journal operation -> data section it mutates
+    LOG_SECTIONS = {
+        "learn": "learned_aliases",
+        "cache": "llm_cache",
+        "uncache": "llm_cache",
+        "register": "event_dedup",
+        "register_fields": "event_dedup_fields",
+    }
+    
+    # Characters of the token-sorted title used as the blocking key
+    TITLE_BLOCK_CHARS = 4
+    
+    # Hash behind event_dedup keys; stores keyed with another hash are re-keyed on load
+    DEDUP_HASH = "blake2b-128"
+    
+    # Rolling-confidence change below which a re-learned alias is not persisted
+    LEARN_EPSILON = 1e-4
+    
+    # How long an LLM response stays cached
+    CACHE_TTL_SECONDS = 24 * 60 * 60
     
     def __init__(self, store_file: str = None):
         self.config = get_config()
         self.store_file = Path(store_file or self.config["store_file"])
+        self.log_file = self.store_file.with_suffix(".log")
+        self._log = None
+        self._log_writes = 0
+        self._pending: List[bytes] = []
+        self._flush_timer: Optional[threading.Timer] = None
+        self._log_lock = threading.Lock()
+        self._batch_depth = 0
+        self._last_size = 0  # Snapshot size in bytes, kept current by load/save
+        self._dedup: Dict[str, DedupRec] = {}
+        self._by_date: Dict[str, set] = {}
+        self._by_token: Dict[str, set] = {}
+        self._cache_expiry: List[Tuple[float, str]] = []
         self.data = self._load_data()
+        atexit.register(self.close)
         
     def _load_data(self) -> Dict[str, Any]:
-        """Load data from persistent store."""
+        """Load data from the snapshot and replay the journal on top of it."""
+        data = self._load_snapshot()
+        # Stores written before the fuzzy index existed lack this section
+        data.setdefault("event_dedup_fields", {})
+        self._log_writes = self._replay_log(data)
+        self._migrate_dedup_keys(data)
+        self._load_records(data)
+        self._build_dedup_index(data)
+        self._build_cache_expiry(data)
+        return data
+    
+    def _load_snapshot(self) -> Dict[str, Any]:
+        """Load the persistent snapshot."""
         if not self.store_file.exists():
             return {
                 "learned_aliases": {},
                 "llm_cache": {},
                 "event_dedup": {},
+                "event_dedup_fields": {},
                 "metadata": {
                     "created": datetime.now().isoformat(),
-                    "version": "1.0"
+                    "version": "1.0",
+                    "dedup_hash": self.DEDUP_HASH
                 }
             }
         
         try:
-            with open(self.store_file, 'r') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError) as e:
+            raw = self.store_file.read_bytes()
+            self._last_size = len(raw)
+            return orjson.loads(raw)
+        except (orjson.JSONDecodeError, IOError) as e:
             logger.warning(f"Could not load store from {self.store_file}: {e}")
             return {
                 "learned_aliases": {},
                 "llm_cache": {},
                 "event_dedup": {},
+                "event_dedup_fields": {},
                 "metadata": {
                     "created": datetime.now().isoformat(),
-                    "version": "1.0"
+                    "version": "1.0",
+                    "dedup_hash": self.DEDUP_HASH
                 }
             }
     
+    def _migrate_dedup_keys(self, data: Dict[str, Any]):
+        """Re-key dedup entries written with an older hash, using their stored fields."""
+        metadata = data.setdefault("metadata", {})
+        if metadata.get("dedup_hash") == self.DEDUP_HASH:
+            return
+        
+        # Entries without stored fields cannot be re-hashed; cleanup sweeps them
+        dedup = {}
+        dedup_fields = {}
+        for key, event_id in data["event_dedup"].items():
+            fields = data["event_dedup_fields"].get(key)
+            if fields is not None:
+                key = hash_dedupe_fields(fields)
+                dedup_fields[key] = fields
+            dedup[key] = event_id
+        
+        data["event_dedup"] = dedup
+        data["event_dedup_fields"] = dedup_fields
+        metadata["dedup_hash"] = self.DEDUP_HASH
+        # Persist the new keys on the next compaction
+        self._log_writes += 1
+    
+    @staticmethod
+    def _to_epoch(timestamp: Any) -> float:
+        """Convert a stored timestamp (epoch seconds or legacy ISO string) to epoch seconds."""
+        if isinstance(timestamp, (int, float)):
+            return timestamp
+        try:
+            return datetime.fromisoformat(timestamp).timestamp()
+        except (ValueError, TypeError):
+            return 0.0  # Unreadable timestamps count as long expired
+    
+    @staticmethod
+    def _parse_day(date_str: str) -> Optional[datetime]:
+        """Parse a YYYY-MM-DD date string, or return None if it is not one."""
+        # Canonical dates go through the C fromisoformat; strptime is pure Python
+        if len(date_str) == 10 and date_str[4] == "-" and date_str[7] == "-":
+            try:
+                return datetime.fromisoformat(date_str)
+            except ValueError:
+                pass
+        try:
+            return datetime.strptime(date_str, "%Y-%m-%d")
+        except ValueError:
+            return None
+    
+    def _load_records(self, data: Dict[str, Any]):
+        """
+        Turn loaded alias and cache dicts into records, once at load.
+        
+        ISO timestamps left by older stores are converted to epoch seconds.
+        """
+        data["llm_cache"] = {
+            key: CacheRec(
+                response=entry.get("response"),
+                timestamp=self._to_epoch(entry.get("timestamp"))
+            )
+            for key, entry in data["llm_cache"].items()
+        }
+        data["learned_aliases"] = {
+            name: AliasRec(
+                last_cuisine=sys.intern(alias_data["last_cuisine"]),
+                rolling_confidence=alias_data.get("rolling_confidence", 0.0),
+                sample_count=alias_data.get("sample_count", 0),
+                last_updated=self._to_epoch(alias_data.get("last_updated"))
+            )
+            for name, alias_data in data["learned_aliases"].items()
+        }
+    
+    def _replay_log(self, data: Dict[str, Any]) -> int:
+        """Apply journal records to loaded data. Returns the number of records applied."""
+        if not self.log_file.exists():
+            return 0
+        
+        applied = 0
+        try:
+            with open(self.log_file, 'rb') as f:
+                for line in f:
+                    try:
+                        record = orjson.loads(line)
+                        section = data[self.LOG_SECTIONS[record["op"]]]
+                    except (orjson.JSONDecodeError, KeyError, TypeError):
+                        logger.warning(f"Skipping unreadable journal record in {self.log_file}")
+                        continue
+                    if "v" in record:
+                        section[record["k"]] = record["v"]
+                    else:
+                        section.pop(record["k"], None)
+                    applied += 1
+        except IOError as e:
+            logger.warning(f"Could not replay journal {self.log_file}: {e}")
+        
+        return applied
+    
+    def _append_log(self, op: str, key: str, value: Any = None):
+        """Buffer one mutation for the journal, compacting when it grows too long."""
+        record = {"op": op, "k": key}
+        if value is not None:
+            record["v"] = value
+        
+        with self._log_lock:
+            self._pending.append(orjson.dumps(record))
+            # Inside batch() the records are written when the block exits
+            if self._flush_timer is None and not self._batch_depth:
+                self._flush_timer = threading.Timer(self.FLUSH_INTERVAL, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+        
+        self._log_writes += 1
+        if self._log_writes >= self.COMPACT_EVERY and not self._batch_depth:
+            self.compact()
+    
+    @contextmanager
+    def batch(self):
+        """
+        Group mutations so they reach disk in a single write when the block exits.
+        
+        Usage:
+            with store.batch():
+                for event_id, event in events:
+                    store.register_event(event_id, event)
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                if self._log_writes >= self.COMPACT_EVERY:
+                    self.compact()
+                else:
+                    self.flush()
+    
+    def flush(self):
+        """Write buffered journal records to disk."""
+        with self._log_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not self._pending:
+                return
+            
+            try:
+                if self._log is None:
+                    self.log_file.parent.mkdir(parents=True, exist_ok=True)
+                    self._log = open(self.log_file, 'ab')
+                self._log.write(b"\n".join(self._pending) + b"\n")
+                self._log.flush()
+            except IOError as e:
+                # Keep the records buffered; compact() or the next flush retries
+                logger.error(f"Could not append to journal {self.log_file}: {e}")
+                return
+            self._pending = []
+    
     def _save_data(self):
         """Save data to persistent store."""
         try:
             self.store_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.store_file, 'w') as f:
-                json.dump(self.data, f, indent=2)
-        except IOError as e:
+            # Write a sibling file and swap it in so readers never see a partial snapshot
+            tmp_file = self.store_file.with_suffix(".tmp")
+            encoded = orjson.dumps(self.data, option=SNAPSHOT_OPTIONS)
+            with open(tmp_file, 'wb') as f:
+                f.write(encoded)
+                f.flush()
+                # Make the bytes durable before the rename can be
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.store_file)
+            self._last_size = len(encoded)
+        except (IOError, TypeError) as e:
             logger.error(f"Could not save store to {self.store_file}: {e}")
+            return False
+        return True
+    
+    def compact(self):
+        """Rewrite the snapshot with the current data and truncate the journal."""
+        # Hold the journal lock from encoding the snapshot until the journal is
+        # dropped, so no record can be appended in between and lost with it
+        with self._log_lock:
+            if not self._save_data():
+                return
+            
+            # The snapshot already holds every buffered mutation
+            self._pending = []
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+            try:
+                self.log_file.unlink(missing_ok=True)
+            except IOError as e:
+                logger.error(f"Could not truncate journal {self.log_file}: {e}")
+            self._log_writes = 0
+    
+    def close(self):
+        """Compact any journaled writes and release the journal file."""
+        if self._log_writes:
+            self.compact()
+        # If compaction failed, keep buffered records in the journal instead
+        self.flush()
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+        atexit.unregister(self.close)
     
     def get_learned_cuisine(self, food_name: str) -> Optional[Tuple[str, float]]:
         """
@@ -71,17 +386,17 @@ class EventStore:
         Returns:
             Tuple of (cuisine, confidence) or None if not learned
         """
-        normalized_name = norm_text(food_name)
+        normalized_name = normalize_food_name(food_name)
         alias_data = self.data["learned_aliases"].get(normalized_name)
         
         if not alias_data:
             return None
             
-        confidence = alias_data.get("rolling_confidence", 0.0)
+        confidence = alias_data.rolling_confidence
         threshold = self.config["learning_config"]["alias_confidence_threshold"]
         
         if confidence >= threshold:
-            return (alias_data["last_cuisine"], confidence)
+            return (alias_data.last_cuisine, confidence)
         
         return None
     
@@ -94,34 +409,50 @@ class EventStore:
             cuisine: Detected cuisine type
             confidence: Confidence score from LLM
         """
-        normalized_name = norm_text(food_name)
+        normalized_name = normalize_food_name(food_name)
         threshold = self.config["learning_config"]["alias_confidence_threshold"]
         
         if confidence < threshold:
             return  # Don't learn low-confidence mappings
         
-        alias_data = self.data["learned_aliases"].get(normalized_name, {
-            "last_cuisine": cuisine,
-            "rolling_confidence": 0.0,
-            "sample_count": 0
-        })
+        # Cuisines come from a small closed set; share one string object per value
+        cuisine = sys.intern(cuisine)
+        alias_data = self.data["learned_aliases"].get(normalized_name)
+        if alias_data is None:
+            alias_data = AliasRec(last_cuisine=cuisine)
         
         # Update rolling average
         alpha = self.config["learning_config"]["rolling_average_alpha"]
-        old_confidence = alias_data["rolling_confidence"]
+        old_confidence = alias_data.rolling_confidence
         new_confidence = alpha * confidence + (1 - alpha) * old_confidence
         
-        alias_data.update({
-            "last_cuisine": cuisine,
-            "rolling_confidence": new_confidence,
-            "sample_count": alias_data["sample_count"] + 1,
-            "last_updated": datetime.now().isoformat()
-        })
+        # A converged alias re-observed with the same cuisine is not worth a journal write
+        unchanged = (
+            alias_data.sample_count > 0
+            and alias_data.last_cuisine == cuisine
+            and abs(new_confidence - old_confidence) < self.LEARN_EPSILON
+        )
+        
+        alias_data.last_cuisine = cuisine
+        alias_data.rolling_confidence = new_confidence
+        alias_data.sample_count += 1
+        alias_data.last_updated = time.time()
+        
+        if unchanged:
+            return
         
         self.data["learned_aliases"][normalized_name] = alias_data
-        self._save_data()
+        self._append_log("learn", normalized_name, alias_data)
         
-        logger.debug(f"Learned cuisine: {normalized_name} -> {cuisine} (conf: {new_confidence:.3f})")
+        logger.debug("Learned cuisine: %s -> %s (conf: %.3f)", normalized_name, cuisine, new_confidence)
+    
+    def _build_cache_expiry(self, data: Dict[str, Any]):
+        """Rebuild the cache expiry heap from the stored cache timestamps."""
+        self._cache_expiry = [
+            (entry.timestamp + self.CACHE_TTL_SECONDS, key)
+            for key, entry in data["llm_cache"].items()
+        ]
+        heapq.heapify(self._cache_expiry)
     
     def get_cached_response(self, cache_key: str) -> Optional[Dict[str, Any]]:
         """Get cached LLM response."""
@@ -131,29 +462,24 @@ class EventStore:
             return None
             
         # Check if cache is still valid (24 hours)
-        try:
-            cached_time = datetime.fromisoformat(cache_entry["timestamp"])
-            if datetime.now() - cached_time > timedelta(hours=24):
-                del self.data["llm_cache"][cache_key]
-                self._save_data()
-                return None
-        except (ValueError, KeyError):
+        if time.time() - cache_entry.timestamp > self.CACHE_TTL_SECONDS:
+            del self.data["llm_cache"][cache_key]
+            self._append_log("uncache", cache_key)
             return None
             
-        return cache_entry["response"]
+        return cache_entry.response
     
     def cache_response(self, cache_key: str, response: Dict[str, Any]):
         """Cache LLM response."""
-        self.data["llm_cache"][cache_key] = {
-            "response": response,
-            "timestamp": datetime.now().isoformat()
-        }
-        self._save_data()
+        entry = CacheRec(response=response, timestamp=time.time())
+        self.data["llm_cache"][cache_key] = entry
+        heapq.heappush(self._cache_expiry, (entry.timestamp + self.CACHE_TTL_SECONDS, cache_key))
+        self._append_log("cache", cache_key, entry)
     
     def generate_cache_key(self, message_id: str, email_body: str) -> str:
         """Generate cache key for email content."""
-        # Create deterministic hash of email content
-        content_hash = hashlib.sha256(email_body.encode('utf-8')).hexdigest()[:16]
+        # Non-cryptographic fingerprint of email content; 64 bits is plenty per message ID
+        content_hash = xxhash.xxh3_64_hexdigest(email_body.encode('utf-8'))
         return f"{message_id}_{content_hash}"
     
     def is_duplicate_event(self, event_data: Dict[str, Any]) -> Optional[str]:
@@ -163,148 +489,270 @@ class EventStore:
         Returns:
             Duplicate event ID if found, None otherwise
         """
-        # Generate deterministic key using safe normalization
-        primary_key = event_dedupe_key(
+        # Generate deterministic key using safe normalization; normalize only once
+        fields = event_dedupe_fields(
             event_data.get("title"),
             event_data.get("date_start"),
             event_data.get("time_start"),
             event_data.get("location")
         )
+        primary_key = hash_dedupe_fields(fields)
         
         # Check exact match first
         if primary_key in self.data["event_dedup"]:
             return self.data["event_dedup"][primary_key]
         
-        # Fuzzy matching for similar events
-        for stored_key, event_id in self.data["event_dedup"].items():
-            stored_title = stored_key.split("|")[0]
-            
-            # Check if titles are similar and dates are close
-            if self._is_similar_event(event_data, stored_key):
-                return event_id
+        # Fuzzy matching, only against events in the same date/title block
+        query = DedupRec.from_fields("", fields)
+        shortlist = self._dedup_candidates(query.title_tokens_sorted, query.date)
+        return self._best_duplicate(query, shortlist, self._dedup)
+    
+    def filter_duplicates(self, events: List[Dict[str, Any]],
+                          event_ids: Optional[List[str]] = None) -> List[Tuple[Dict[str, Any], Optional[str]]]:
+        """
+        Check a batch of events against registered events and each other.
+        
+        An event is also a duplicate of an earlier event in the same batch
+        that was not itself a duplicate. Nothing is registered, so callers
+        should register the survivors they keep.
+        
+        Args:
+            events: Event dictionaries to check, in order
+            event_ids: IDs of the events, reported when a later event in the
+                batch duplicates them (their dedup keys are reported otherwise)
+        
+        Returns:
+            List of (event, duplicate event ID or None) in input order
+        """
+        dedup = self.data["event_dedup"]
+        
+        fields = event_dedupe_fields_batch(events)
+        primary_keys = hash_dedupe_fields_batch(fields)
+        
+        # Survivors of this batch, indexed the same way as registered events
+        batch_dedup: Dict[str, DedupRec] = {}
+        batch_by_date: Dict[str, set] = {}
+        batch_by_token: Dict[str, set] = {}
+        
+        results = []
+        for i, (event, event_fields, primary_key) in enumerate(zip(events, fields, primary_keys)):
+            duplicate_id = dedup.get(primary_key)
+            if duplicate_id is None and primary_key in batch_dedup:
+                duplicate_id = batch_dedup[primary_key].event_id
+            query = DedupRec.from_fields("", event_fields)
+            if duplicate_id is None:
+                shortlist = self._dedup_candidates(query.title_tokens_sorted, query.date)
+                duplicate_id = self._best_duplicate(query, shortlist, self._dedup)
+            if duplicate_id is None:
+                shortlist = self._dedup_candidates(query.title_tokens_sorted, query.date,
+                                                   batch_by_token, batch_by_date)
+                duplicate_id = self._best_duplicate(query, shortlist, batch_dedup)
+            if duplicate_id is None:
+                query.event_id = event_ids[i] if event_ids is not None else primary_key
+                batch_dedup[primary_key] = query
+                batch_by_date.setdefault(query.date, set()).add(primary_key)
+                batch_by_token.setdefault(self._title_block(query.title_tokens_sorted), set()).add(primary_key)
+            results.append((event, duplicate_id))
+        
+        return results
+    
+    @classmethod
+    def _title_block(cls, title_tokens_sorted: str) -> str:
+        """Blocking key for a title: prefix of its sorted tokens."""
+        return title_tokens_sorted[:cls.TITLE_BLOCK_CHARS]
+    
+    def _index_dedup_entry(self, key: str, record: "DedupRec"):
+        """Add one dedup record to the blocking indices."""
+        self._dedup[key] = record
+        self._by_date.setdefault(record.date, set()).add(key)
+        self._by_token.setdefault(self._title_block(record.title_tokens_sorted), set()).add(key)
+    
+    def _unindex_dedup_entry(self, key: str):
+        """Remove one dedup record from the title index (date buckets are dropped whole)."""
+        record = self._dedup.pop(key, None)
+        if record is None:
+            return
+        block = self._title_block(record.title_tokens_sorted)
+        keys = self._by_token.get(block)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_token[block]
+    
+    def _build_dedup_index(self, data: Dict[str, Any]):
+        """Rebuild the dedup records and blocking indices from the stored dedup fields."""
+        self._dedup = {}
+        self._by_date = {}
+        self._by_token = {}
+        for key, stored_key in data["event_dedup_fields"].items():
+            event_id = data["event_dedup"].get(key)
+            record = DedupRec.from_fields(event_id, stored_key) if event_id is not None else None
+            if record is not None:
+                self._index_dedup_entry(key, record)
+    
+    def _dedup_candidates(self, title_tokens_sorted: str, date_start: str,
+                          by_token: Optional[Dict[str, set]] = None,
+                          by_date: Optional[Dict[str, set]] = None) -> List[str]:
+        """Keys sharing the event's title block and dated within 1 day of it.
+        
+        The store's own blocking indices are searched unless others are given.
+        """
+        if by_token is None:
+            by_token = self._by_token
+        if by_date is None:
+            by_date = self._by_date
+        same_block = by_token.get(self._title_block(title_tokens_sorted))
+        if not same_block:
+            return []
+        
+        event_date = self._parse_day(date_start)
+        if event_date is None:
+            return []
+        
+        nearby = set()
+        for offset in (-1, 0, 1):
+            day = (event_date + timedelta(days=offset)).date().isoformat()
+            nearby.update(by_date.get(day, ()))
+        
+        return sorted(nearby & same_block)
+    
+    def _best_duplicate(self, query: "DedupRec", shortlist: List[str],
+                        records: Dict[str, "DedupRec"]) -> Optional[str]:
+        """
+        Event ID of the best-scoring similar record in the shortlist, if any.
         
+        Every duplicate check goes through here, so single and batch checks
+        agree on which event an incoming one duplicates.
+        """
+        if not shortlist:
+            return None
+        # Score the whole shortlist in one call, best matches first
+        matches = process.extract(
+            query.norm_title,
+            {key: records[key].norm_title for key in shortlist},
+            scorer=fuzz.token_sort_ratio,
+            processor=fuzz_utils.default_process,
+            score_cutoff=90,
+            limit=None
+        )
+        for _, _, key in matches:
+            record = records[key]
+            if self._is_similar_event(query.norm_title, query.location, record):
+                return record.event_id
         return None
     
-    def _is_similar_event(self, event_data: Dict[str, Any], stored_key: str) -> bool:
-        """Check if two events are similar enough to be duplicates."""
-        try:
-            stored_parts = stored_key.split("|")
-            if len(stored_parts) < 4:
-                return False
-                
-            stored_title, stored_date, stored_time, stored_location = stored_parts[:4]
-            
-            # Title similarity (token sort ratio)
-            title_similarity = SequenceMatcher(
-                None, 
-                norm_text(event_data.get("title")),
-                stored_title
-            ).ratio()
-            
-            if title_similarity < 0.9:
-                return False
-            
-            # Date proximity (within 1 day)
-            try:
-                event_date = datetime.strptime(event_data.get("date_start", ""), "%Y-%m-%d")
-                stored_date = datetime.strptime(stored_date, "%Y-%m-%d")
-                date_diff = abs((event_date - stored_date).days)
-                
-                if date_diff > 1:
-                    return False
-            except ValueError:
-                return False
-            
-            # Location similarity (if both have locations)
-            event_location = norm_text(event_data.get("location"))
-            if event_location and stored_location:
-                location_similarity = SequenceMatcher(
-                    None, event_location, stored_location
-                ).ratio()
-                if location_similarity < 0.8:
-                    return False
-            
-            return True
-            
-        except Exception as e:
-            logger.debug(f"Error in similarity check: {e}")
+    def _is_similar_event(self, event_title: str, event_location: str, record: "DedupRec") -> bool:
+        """
+        Check if two events are similar enough to be duplicates.
+        
+        Date proximity is already guaranteed by the blocking index, so only
+        titles and locations are compared here.
+        """
+        # Title similarity (token sort ratio)
+        title_similarity = fuzz.token_sort_ratio(
+            event_title,
+            record.norm_title,
+            processor=fuzz_utils.default_process
+        ) / 100.0
+        
+        if title_similarity < 0.9:
             return False
+        
+        # Location similarity (if both have locations)
+        if event_location and record.location:
+            location_similarity = fuzz.ratio(event_location, record.location) / 100.0
+            if location_similarity < 0.8:
+                return False
+        
+        return True
     
     def register_event(self, event_id: str, event_data: Dict[str, Any]):
         """Register event for deduplication tracking."""
-        primary_key = event_dedupe_key(
+        stored_key = event_dedupe_fields(
             event_data.get("title"),
             event_data.get("date_start"),
             event_data.get("time_start"),
             event_data.get("location")
         )
+        primary_key = hash_dedupe_fields(stored_key)
         self.data["event_dedup"][primary_key] = event_id
-        self._save_data()
+        self.data["event_dedup_fields"][primary_key] = stored_key
+        self._index_dedup_entry(primary_key, DedupRec.from_fields(event_id, stored_key))
+        self._append_log("register", primary_key, event_id)
+        self._append_log("register_fields", primary_key, stored_key)
     
     def merge_event_data(self, base_event: Dict[str, Any], new_event: Dict[str, Any]) -> Dict[str, Any]:
         """Merge two event data dictionaries."""
         merged = base_event.copy()
         
-        # Merge URLs
-        base_urls = set(base_event.get("urls", []))
-        new_urls = set(new_event.get("urls", []))
-        merged["urls"] = list(base_urls.union(new_urls))
-        
-        # Merge mailing lists
-        base_lists = set(base_event.get("mailing_list", []))
-        new_lists = set(new_event.get("mailing_list", []))
-        merged["mailing_list"] = list(base_lists.union(new_lists))
+        # Merge URLs and mailing lists, keeping first-seen order
+        for key in ("urls", "mailing_list"):
+            base_values = base_event.get(key, [])
+            new_values = new_event.get(key, [])
+            # The same list on both sides (re-merging an event) needs no concatenation
+            values = base_values if new_values is base_values else [*base_values, *new_values]
+            merged[key] = list(dict.fromkeys(values))
         
         # Use higher confidence scores
         if "confidence" in new_event and "confidence" in base_event:
+            base_confidence = base_event["confidence"]
+            new_confidence = new_event["confidence"]
             merged["confidence"] = {}
-            for key in ["category", "cuisine"]:
-                if key in new_event["confidence"] and key in base_event["confidence"]:
-                    merged["confidence"][key] = max(
-                        new_event["confidence"][key],
-                        base_event["confidence"][key]
-                    )
-                elif key in new_event["confidence"]:
-                    merged["confidence"][key] = new_event["confidence"][key]
-                elif key in base_event["confidence"]:
-                    merged["confidence"][key] = base_event["confidence"][key]
+            for key in ("category", "cuisine"):
+                scores = [confidence[key] for confidence in (base_confidence, new_confidence) if key in confidence]
+                if scores:
+                    merged["confidence"][key] = max(scores)
         
         return merged
     
+    def _drop_keys(self, section: str, keys: set):
+        """Remove keys from a data section, rebuilding it in one pass when most of it goes."""
+        entries = self.data[section]
+        if len(keys) * 2 > len(entries):
+            self.data[section] = {key: value for key, value in entries.items() if key not in keys}
+        else:
+            for key in keys:
+                entries.pop(key, None)
+    
     def cleanup_old_data(self, days: int = 30):
-        """Clean up old cache and dedup data."""
+        """Clean up expired or old cache entries and old dedup data."""
         cutoff_date = datetime.now() - timedelta(days=days)
         
-        # Clean up old cache entries
-        old_cache_keys = []
-        for key, entry in self.data["llm_cache"].items():
-            try:
-                cached_time = datetime.fromisoformat(entry["timestamp"])
-                if cached_time < cutoff_date:
-                    old_cache_keys.append(key)
-            except (ValueError, KeyError):
-                old_cache_keys.append(key)
-        
-        for key in old_cache_keys:
-            del self.data["llm_cache"][key]
-        
-        # Clean up old dedup entries (keep last 30 days)
-        old_dedup_keys = []
-        for key, event_id in self.data["event_dedup"].items():
-            try:
-                # Extract date from key
-                date_part = key.split("|")[1]
-                event_date = datetime.strptime(date_part, "%Y-%m-%d")
-                if event_date < cutoff_date:
-                    old_dedup_keys.append(key)
-            except (ValueError, IndexError):
-                old_dedup_keys.append(key)
+        # Pop cache entries that have expired or were cached before the cutoff
+        cache = self.data["llm_cache"]
+        expire_before = max(time.time(), cutoff_date.timestamp() + self.CACHE_TTL_SECONDS)
+        old_cache_keys = set()
+        while self._cache_expiry and self._cache_expiry[0][0] < expire_before:
+            expires_at, key = heapq.heappop(self._cache_expiry)
+            entry = cache.get(key)
+            # Skip heap records left behind by re-cached or already evicted keys
+            if entry is None or entry.timestamp + self.CACHE_TTL_SECONDS != expires_at:
+                continue
+            old_cache_keys.add(key)
+        
+        # Clean up old dedup entries (keep last 30 days), one date bucket at a time
+        dedup = self.data["event_dedup"]
+        dedup_fields = self.data["event_dedup_fields"]
+        old_dedup_keys = set()
+        for date_part in list(self._by_date):
+            day = self._parse_day(date_part)
+            if day is not None and day >= cutoff_date:
+                continue
+            old_dedup_keys.update(self._by_date.pop(date_part))
+        
+        # Entries stored before dedup fields were tracked carry no date
+        if len(dedup) > len(dedup_fields):
+            old_dedup_keys.update(key for key in dedup if key not in dedup_fields)
         
         for key in old_dedup_keys:
-            del self.data["event_dedup"][key]
+            self._unindex_dedup_entry(key)
+        
+        self._drop_keys("llm_cache", old_cache_keys)
+        self._drop_keys("event_dedup", old_dedup_keys)
+        self._drop_keys("event_dedup_fields", old_dedup_keys)
         
         if old_cache_keys or old_dedup_keys:
-            self._save_data()
+            self.compact()
             logger.info(f"Cleaned up {len(old_cache_keys)} cache entries and {len(old_dedup_keys)} dedup entries")
     
     def get_stats(self) -> Dict[str, Any]:
@@ -313,5 +761,5 @@ class EventStore:
             "learned_aliases_count": len(self.data["learned_aliases"]),
             "cache_entries_count": len(self.data["llm_cache"]),
             "dedup_entries_count": len(self.data["event_dedup"]),
-            "store_size_mb": self.store_file.stat().st_size / (1024 * 1024) if self.store_file.exists() else 0
+            "store_size_mb": self._last_size / (1024 * 1024)
         }
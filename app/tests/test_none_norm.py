@@ -1,8 +1,13 @@
 """
 Regression tests for None-safe text normalization.
 """
+import hashlib
 import pytest
-from app.utils import norm_text, event_dedupe_key, safe_lower, normalize_food_name
+from app.utils import (
+    norm_text, event_dedupe_key, event_dedupe_fields, event_dedupe_fields_batch,
+    hash_dedupe_fields, hash_dedupe_fields_batch, safe_lower, normalize_food_name,
+    EMPTY_DEDUPE_KEY
+)
 
 
 def test_norm_text_none_ok():
@@ -26,7 +31,37 @@ def test_event_dedupe_key_all_none_ok():
     """Test that event_dedupe_key handles all None values safely."""
     key = event_dedupe_key(None, None, None, None)
     assert isinstance(key, str)
-    assert len(key) == 32  # MD5 hash length
+    assert len(key) == 32  # BLAKE2b-128 hex digest length
+    
+    # The precomputed empty key matches a normally hashed blank event
+    assert key == event_dedupe_key("  ", "", "", " ")
+
+
+def test_batch_dedupe_keys_match_single():
+    """Test that batch-hashed keys equal the single-event keys stored in the dedup index."""
+    events = [
+        {"title": "Test Event", "date_start": "2025-01-15", "time_start": "14:00", "location": "Room 101"},
+        {"title": "Café Night", "date_start": "2025-01-16"},
+        {},
+    ]
+    
+    fields = event_dedupe_fields_batch(events)
+    assert fields == [
+        event_dedupe_fields(e.get("title"), e.get("date_start"), e.get("time_start"), e.get("location"))
+        for e in events
+    ]
+    assert hash_dedupe_fields_batch(fields) == [hash_dedupe_fields(f) for f in fields]
+    assert hash_dedupe_fields_batch(fields) == [
+        event_dedupe_key(e.get("title"), e.get("date_start"), e.get("time_start"), e.get("location"))
+        for e in events
+    ]
+    assert hash_dedupe_fields_batch([]) == []
+    
+    # A blank event hits the precomputed key on both hashing paths
+    blank = event_dedupe_fields(None, "", "  ", None)
+    assert hash_dedupe_fields(blank) == EMPTY_DEDUPE_KEY
+    assert hash_dedupe_fields_batch([blank]) == [EMPTY_DEDUPE_KEY]
+    assert EMPTY_DEDUPE_KEY == hashlib.blake2b(b"|||", digest_size=16).hexdigest()
 
 
 def test_event_dedupe_key_mixed_none_ok():
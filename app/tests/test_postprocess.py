@@ -1,10 +1,13 @@
 """
 Tests for the post-processing functionality with learning and confidence thresholds.
 """
+import os
+import tempfile
 import pytest
+from contextlib import nullcontext
 from unittest.mock import Mock
 from ..postprocess import PostProcessor
-from ..store import EventStore
+from ..store import EventStore, AliasRec
 from ..schema import ParsedEvent, FoodItem, ConfidenceScores
 
 @pytest.fixture
@@ -13,6 +16,7 @@ def mock_store():
     store = Mock(spec=EventStore)
     store.get_learned_cuisine.return_value = None
     store.learn_cuisine.return_value = None
+    store.batch.return_value = nullcontext()
     return store
 
 @pytest.fixture
@@ -124,10 +128,50 @@ def test_cuisine_learning(post_processor, mock_store):
     # Should have learned the cuisine mapping
     mock_store.learn_cuisine.assert_called_with("sushi", "Japanese", 0.8)
 
+def test_repeated_food_items_kept_and_learned(post_processor, mock_store):
+    """Test that repeated dishes keep every item and learn from every mention."""
+    event_data = {
+        "title": "Test Event",
+        "date_start": "2025-09-20",
+        "food": [
+            {"name": "Pizza", "quantity_hint": "plenty"},
+            {"name": "sushi", "cuisine": "Japanese", "confidence": {"cuisine": 0.8}},
+            {"name": "pizza ", "cuisine": "Italian", "quantity_hint": "2 slices", "confidence": {"cuisine": 0.9}},
+            {"name": "PIZZA", "cuisine": "Italian", "confidence": {"cuisine": 0.9}}
+        ]
+    }
+    
+    result = post_processor.process_event(event_data)
+    assert result is not None
+    
+    # Every item is kept, in order, with its own fields
+    assert [item.name for item in result.food] == ["pizza", "sushi", "pizza", "pizza"]
+    assert [item.quantity_hint for item in result.food] == ["plenty", None, "2 slices", None]
+    assert [item.cuisine for item in result.food] == [None, "Japanese", "Italian", "Italian"]
+    
+    # Every qualifying mention is a learning sample
+    assert mock_store.learn_cuisine.call_count == 3
+
+def test_repeated_food_items_use_cuisine_learned_earlier():
+    """Test that a bare mention sees a cuisine learned from an earlier item in the same event."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        store = EventStore(os.path.join(temp_dir, "store.json"))
+        processor = PostProcessor(store=store)
+        event_data = {
+            "title": "Test Event",
+            "date_start": "2025-09-20",
+            "food": [{"name": "sushi", "cuisine": "Japanese"}] * 4 + [{"name": "sushi"}]
+        }
+        
+        result = processor.process_event(event_data)
+        assert [item.cuisine for item in result.food] == ["Japanese"] * 5
+        assert store.data["learned_aliases"]["sushi"].sample_count == 4
+        store.close()
+
 def test_batch_processing_with_deduplication(post_processor, mock_store):
     """Test batch processing with deduplication."""
     # Mock no duplicates
-    mock_store.is_duplicate_event.return_value = None
+    mock_store.filter_duplicates.side_effect = lambda events, event_ids=None: [(event, None) for event in events]
     
     events_data = [
         {
@@ -157,7 +201,7 @@ def test_batch_processing_with_deduplication(post_processor, mock_store):
 def test_batch_processing_with_duplicates(post_processor, mock_store):
     """Test batch processing with duplicate detection."""
     # Mock duplicate for second event
-    mock_store.is_duplicate_event.side_effect = [None, "event1"]
+    mock_store.filter_duplicates.side_effect = lambda events, event_ids=None: list(zip(events, [None, "event1"]))
     
     events_data = [
         {
@@ -231,9 +275,9 @@ def test_learning_stats(post_processor, mock_store):
     # Mock learned aliases data
     mock_store.data = {
         "learned_aliases": {
-            "pizza": {"rolling_confidence": 0.9},
-            "sushi": {"rolling_confidence": 0.7},
-            "burger": {"rolling_confidence": 0.5}
+            "pizza": AliasRec(last_cuisine="Italian", rolling_confidence=0.9),
+            "sushi": AliasRec(last_cuisine="Japanese", rolling_confidence=0.7),
+            "burger": AliasRec(last_cuisine="American", rolling_confidence=0.5)
         }
     }
     
@@ -251,3 +295,16 @@ def test_cleanup_functionality(post_processor, mock_store):
     # Should call store cleanup
     mock_store.cleanup_old_data.assert_called_with(30)
 
+
+def test_punctuation_and_mojibake_normalization(post_processor):
+    """Test that fancy punctuation and cp1252 mojibake are folded to ASCII."""
+    event_data = {
+        "title": "Talk â€“ “Deep Learning”",
+        "date_start": "2025-09-20",
+        "location": "Room 101"
+    }
+    
+    result = post_processor.process_event(event_data)
+    assert result is not None
+    assert result.title == 'Talk - "Deep Learning"'
+    assert result.location == "Room 101"
@@ -5,6 +5,7 @@ Run this to execute all tests for the new configurable system.
 """
 import sys
 import os
+import importlib.util
 import pytest
 
 # Add the app directory to the path
@@ -14,13 +15,20 @@ def run_tests():
     """Run all tests."""
     test_dir = os.path.dirname(os.path.abspath(__file__))
     
-    # Run pytest on the test directory
-    pytest.main([
+    args = [
         test_dir,
         "-v",  # Verbose output
         "--tb=short",  # Short traceback format
-        "--color=yes"  # Colored output
-    ])
+        "--color=yes",  # Colored output
+        "-p", "no:cacheprovider"  # Skip .pytest_cache reads/writes
+    ]
+    
+    # Spread tests across CPUs when pytest-xdist is installed
+    if importlib.util.find_spec("xdist") is not None:
+        args += ["-n", "auto"]
+    
+    # Run pytest on the test directory
+    pytest.main(args)
 
 if __name__ == "__main__":
     run_tests()
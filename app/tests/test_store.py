@@ -4,6 +4,8 @@ Tests for the EventStore learning and caching functionality.
 import pytest
 import tempfile
 import os
+import hashlib
+from datetime import datetime
 from ..store import EventStore
 
 @pytest.fixture
@@ -16,8 +18,10 @@ def temp_store():
     yield store
     
     # Cleanup
-    if os.path.exists(temp_file):
-        os.unlink(temp_file)
+    store.close()
+    for path in (temp_file, str(store.log_file)):
+        if os.path.exists(path):
+            os.unlink(path)
 
 def test_learned_cuisine_retrieval(temp_store):
     """Test learned cuisine retrieval."""
@@ -86,6 +90,11 @@ def test_cache_key_generation(temp_store):
     
     # Different content should generate different key
     assert key1 != key3
+    
+    # Keys are the message ID plus a fixed-width content fingerprint
+    prefix, _, digest = key1.rpartition("_")
+    assert prefix == "msg123"
+    assert len(digest) == 16
 
 def test_duplicate_detection(temp_store):
     """Test event duplicate detection."""
@@ -201,3 +210,181 @@ def test_cleanup_functionality(temp_store):
     stats_after = temp_store.get_stats()
     assert stats_after["learned_aliases_count"] == initial_stats["learned_aliases_count"]
 
+def test_journal_replay_and_compaction(temp_store):
+    """Test that journaled writes survive a reload and compaction clears the journal."""
+    temp_store.cache_response("test_key", {"test": "data"})
+    temp_store.register_event("event1", {"title": "Test"})
+    
+    # Writes are buffered until the flush timer (or an explicit flush) runs
+    assert not temp_store.log_file.exists()
+    temp_store.flush()
+    assert temp_store.log_file.exists()
+    
+    # A fresh store replays the journal on top of the snapshot
+    reloaded = EventStore(str(temp_store.store_file))
+    assert reloaded.get_cached_response("test_key") == {"test": "data"}
+    assert reloaded.get_stats()["dedup_entries_count"] == 1
+    reloaded.close()
+    
+    # Compaction folds the journal into the snapshot
+    temp_store.compact()
+    assert not temp_store.log_file.exists()
+    reloaded = EventStore(str(temp_store.store_file))
+    assert reloaded.get_cached_response("test_key") == {"test": "data"}
+    reloaded.close()
+
+def test_similar_event_blocking_index(temp_store):
+    """Test that fuzzy matches come from the date/title blocking index and survive a reload."""
+    temp_store.register_event("event1", {
+        "title": "Machine Learning Workshop",
+        "date_start": "2025-09-20",
+        "time_start": "14:00",
+        "location": "Room 101"
+    })
+    
+    similar = {
+        "title": "Machine Learning Workshops",
+        "date_start": "2025-09-21",
+        "time_start": "15:00",
+        "location": "Room 101"
+    }
+    assert temp_store.is_duplicate_event(similar) == "event1"
+    
+    # Same title more than a day away falls outside the date buckets
+    assert temp_store.is_duplicate_event({**similar, "date_start": "2025-09-25"}) is None
+    
+    # Indices are rebuilt when the store is reloaded
+    temp_store.flush()
+    reloaded = EventStore(str(temp_store.store_file))
+    assert reloaded.is_duplicate_event(similar) == "event1"
+    reloaded.close()
+
+def test_filter_duplicates_batch(temp_store):
+    """Test batch duplicate filtering against registered events."""
+    temp_store.register_event("event1", {
+        "title": "Workshop on Machine Learning",
+        "date_start": "2025-09-20",
+        "time_start": "14:00",
+        "location": "Room 101"
+    })
+    
+    events = [
+        {"title": "workshop on machine learning", "date_start": "2025-09-20", "time_start": "14:00", "location": "Room 101"},
+        {"title": "Machine Learning Workshop", "date_start": "2025-09-20", "time_start": "15:00", "location": "Room 101"},
+        {"title": "Machine Learning Workshop", "date_start": "2025-09-20", "time_start": "14:00", "location": "Main Auditorium"},
+        {"title": "Pizza Night", "date_start": "2025-09-20"},
+    ]
+    
+    results = temp_store.filter_duplicates(events)
+    assert [event for event, _ in results] == events
+    assert [duplicate_id for _, duplicate_id in results] == ["event1", "event1", None, None]
+
+def test_filter_duplicates_within_batch(temp_store):
+    """Test that events in one batch are checked against earlier survivors of the batch."""
+    events = [
+        {"title": "Pizza Night", "date_start": "2025-09-20", "time_start": "18:00", "location": "Room 101"},
+        {"title": "pizza night", "date_start": "2025-09-20", "time_start": "18:00", "location": "Room 101"},
+        {"title": "Pizza Nights", "date_start": "2025-09-21", "time_start": "19:00", "location": "Room 101"},
+        {"title": "Board Games", "date_start": "2025-09-20", "time_start": "18:00", "location": "Room 101"},
+    ]
+    
+    results = temp_store.filter_duplicates(events, ["event1", "event2", "event3", "event4"])
+    assert [duplicate_id for _, duplicate_id in results] == [None, "event1", "event1", None]
+    
+    # Nothing is registered by the check itself
+    assert temp_store.is_duplicate_event(events[0]) is None
+
+def test_single_and_batch_checks_pick_best_match(temp_store):
+    """Test that both duplicate checks report the best-scoring stored event."""
+    for event_id, title in (("event1", "Machine Learning Workshops"), ("event2", "Machine Learning Workshop")):
+        temp_store.register_event(event_id, {
+            "title": title,
+            "date_start": "2025-09-20",
+            "time_start": "14:00",
+            "location": "Room 103"
+        })
+    
+    # The weaker match sorts first by dedup key, so hash order alone would pick it
+    query = {"title": "Machine Learning Workshop", "date_start": "2025-09-21", "time_start": "15:00", "location": "Room 103"}
+    assert temp_store.is_duplicate_event(query) == "event2"
+    assert temp_store.filter_duplicates([query]) == [(query, "event2")]
+
+def test_cleanup_evicts_expired_entries(temp_store):
+    """Test that cleanup pops expired cache entries and old dedup date buckets."""
+    temp_store.cache_response("old_key", {"test": "old"})
+    temp_store.cache_response("new_key", {"test": "new"})
+    
+    # Age the first entry past the TTL and rebuild the expiry heap from disk form
+    temp_store.data["llm_cache"]["old_key"].timestamp -= temp_store.CACHE_TTL_SECONDS + 1
+    temp_store._build_cache_expiry(temp_store.data)
+    
+    old_event = {"title": "Old Event", "date_start": "2020-01-01"}
+    temp_store.register_event("old_event", old_event)
+    temp_store.register_event("new_event", {"title": "New Event", "date_start": datetime.now().strftime("%Y-%m-%d")})
+    
+    temp_store.cleanup_old_data(days=30)
+    
+    assert "old_key" not in temp_store.data["llm_cache"]
+    assert temp_store.get_cached_response("new_key") == {"test": "new"}
+    assert temp_store.is_duplicate_event(old_event) is None
+    assert temp_store.get_stats()["dedup_entries_count"] == 1
+
+def test_legacy_iso_timestamps_migrated(temp_store):
+    """Test that ISO timestamps from older stores are converted to epoch seconds on load."""
+    temp_store.cache_response("test_key", {"test": "data"})
+    temp_store.learn_cuisine("pizza", "Italian", 0.8)
+    temp_store.data["llm_cache"]["test_key"].timestamp = datetime.now().isoformat()
+    temp_store.data["learned_aliases"]["pizza"].last_updated = datetime.now().isoformat()
+    temp_store.compact()
+    
+    reloaded = EventStore(str(temp_store.store_file))
+    assert isinstance(reloaded.data["llm_cache"]["test_key"].timestamp, float)
+    assert isinstance(reloaded.data["learned_aliases"]["pizza"].last_updated, float)
+    assert reloaded.get_cached_response("test_key") == {"test": "data"}
+    reloaded.close()
+
+def test_batch_writes_journal_once(temp_store):
+    """Test that mutations inside batch() are written together when the block exits."""
+    with temp_store.batch():
+        temp_store.register_event("event1", {"title": "Event 1", "date_start": "2025-09-20"})
+        temp_store.learn_cuisine("pizza", "Italian", 0.8)
+        assert temp_store._flush_timer is None
+        assert not temp_store.log_file.exists()
+    
+    assert temp_store.log_file.exists()
+    reloaded = EventStore(str(temp_store.store_file))
+    assert reloaded.get_stats()["dedup_entries_count"] == 1
+    assert "pizza" in reloaded.data["learned_aliases"]
+    reloaded.close()
+
+def test_converged_alias_not_journaled(temp_store):
+    """Test that re-learning a converged alias updates memory without a journal write."""
+    temp_store.learn_cuisine("pizza", "Italian", 0.8)
+    temp_store.data["learned_aliases"]["pizza"].rolling_confidence = 0.8
+    writes = temp_store._log_writes
+    
+    temp_store.learn_cuisine("pizza", "Italian", 0.8)
+    assert temp_store._log_writes == writes
+    assert temp_store.data["learned_aliases"]["pizza"].sample_count == 2
+    
+    # A different cuisine is always persisted
+    temp_store.learn_cuisine("pizza", "American", 0.8)
+    assert temp_store._log_writes == writes + 1
+
+def test_legacy_dedup_keys_rehashed(temp_store):
+    """Test that dedup entries keyed with an older hash are re-keyed on load."""
+    event = {"title": "Test Event", "date_start": "2025-09-20", "time_start": "14:00", "location": "Room 101"}
+    temp_store.register_event("event1", event)
+    
+    # Simulate a store written with MD5 keys and no hash marker
+    fields = temp_store.data["event_dedup_fields"]
+    legacy_key = hashlib.md5(next(iter(fields.values())).encode("utf-8")).hexdigest()
+    temp_store.data["event_dedup"] = {legacy_key: "event1"}
+    temp_store.data["event_dedup_fields"] = {legacy_key: next(iter(fields.values()))}
+    del temp_store.data["metadata"]["dedup_hash"]
+    temp_store.compact()
+    
+    reloaded = EventStore(str(temp_store.store_file))
+    assert legacy_key not in reloaded.data["event_dedup"]
+    assert reloaded.is_duplicate_event(event) == "event1"
+    reloaded.close()
@@ -1,15 +1,23 @@
 """
 Utility functions for text normalization and safe string operations.
 """
-import re
+import hashlib
 import unicodedata
-from typing import Any, Optional
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+
+# Longer strings (email bodies) are normalized without memoizing them
+NORM_CACHE_MAX_LEN = 256
 
 
 def norm_text(s: Any) -> str:
     """
     Null-safe text normalization.
     
+    Short strings recur constantly (titles, times, locations, food names),
+    so their results are memoized.
+    
     Args:
         s: Any value to normalize
         
@@ -18,12 +26,46 @@ def norm_text(s: Any) -> str:
     """
     if not isinstance(s, str):
         return ""
+    if len(s) <= NORM_CACHE_MAX_LEN:
+        return _norm_str_cached(s)
+    return _norm_str(s)
+
+
+def _norm_str(s: str) -> str:
+    if s.isascii():
+        # NFKC leaves ASCII unchanged and casefold() is lower() on it
+        s = s.lower()
+        # Common case: no tabs/newlines, doubled spaces or edge spaces to fix
+        if s.isprintable() and "  " not in s and s[:1] != " " and s[-1:] != " ":
+            return s
+        return " ".join(s.split())
     
-    # Normalize unicode and convert to lowercase
-    s = unicodedata.normalize("NFKC", s).casefold()
+    # Normalize unicode, lowercase, then collapse whitespace and strip in one split/join
+    return " ".join(unicodedata.normalize("NFKC", s).casefold().split())
+
+
+_norm_str_cached = lru_cache(maxsize=16384)(_norm_str)
+
+
+# Fields string and key of an event whose components are all empty
+EMPTY_DEDUPE_FIELDS = "|||"
+EMPTY_DEDUPE_KEY = hashlib.blake2b(EMPTY_DEDUPE_FIELDS.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def event_dedupe_fields(title: Any, date_start: Any, time_start: Any, location: Any) -> str:
+    """
+    Join normalized event components into a "title|date|time|location" string.
     
-    # Collapse whitespace and strip
-    return re.sub(r"\s+", " ", s).strip()
+    Args:
+        title: Event title
+        date_start: Event start date
+        time_start: Event start time
+        location: Event location
+        
+    Returns:
+        Pipe-separated normalized event components
+    """
+    return f"{norm_text(title)}|{date_start or ''}|{norm_text(time_start)}|{norm_text(location)}"
 
 
 def event_dedupe_key(title: Any, date_start: Any, time_start: Any, location: Any) -> str:
@@ -37,42 +79,70 @@ def event_dedupe_key(title: Any, date_start: Any, time_start: Any, location: Any
         location: Event location
         
     Returns:
-        MD5 hash of normalized event components
+        BLAKE2b-128 hex digest of normalized event components
     """
-    import hashlib
-    
-    base = "|".join([
-        norm_text(title),
-        str(date_start or ""),
-        norm_text(time_start),
-        norm_text(location),
-    ])
+    return hash_dedupe_fields(event_dedupe_fields(title, date_start, time_start, location))
+
+
+def hash_dedupe_fields(fields: str) -> str:
+    """
+    Hash a string from event_dedupe_fields into a deduplication key.
     
-    return hashlib.md5(base.encode("utf-8")).hexdigest()
+    Args:
+        fields: Pipe-separated normalized event components
+        
+    Returns:
+        BLAKE2b-128 hex digest of the components
+    """
+    # Sparse events with every component empty all share one precomputed key
+    if fields == EMPTY_DEDUPE_FIELDS:
+        return EMPTY_DEDUPE_KEY
+    return hashlib.blake2b(fields.encode("utf-8"), digest_size=16).hexdigest()
 
 
-def safe_lower(s: Any) -> str:
+def hash_dedupe_fields_batch(fields: List[str]) -> List[str]:
     """
-    Safe lowercase conversion that handles None values.
+    Hash a list of event_dedupe_fields strings, as hash_dedupe_fields would.
     
     Args:
-        s: String to convert to lowercase
+        fields: Pipe-separated normalized event components
         
     Returns:
-        Lowercase string, empty string if input is None
+        BLAKE2b-128 hex digests, in input order
     """
-    return norm_text(s)
+    # Same digest as hash_dedupe_fields, inlined to skip a Python call per event
+    blake2b = hashlib.blake2b
+    return [
+        EMPTY_DEDUPE_KEY if f == EMPTY_DEDUPE_FIELDS
+        else blake2b(f.encode("utf-8"), digest_size=16).hexdigest()
+        for f in fields
+    ]
 
 
-def normalize_food_name(food_name: Any) -> str:
+def event_dedupe_fields_batch(events: List[Dict[str, Any]]) -> List[str]:
     """
-    Normalize food name for consistent storage and lookup.
+    Build event_dedupe_fields strings for a list of event dicts.
+    
+    Each component is pulled out into its own column and normalized in one
+    map() pass, rather than running the four normalizations event by event.
     
     Args:
-        food_name: Food name to normalize
+        events: Event dictionaries with title/date_start/time_start/location
         
     Returns:
-        Normalized food name
+        Pipe-separated normalized event components, in input order
     """
-    return norm_text(food_name)
+    titles = map(norm_text, [event.get("title") for event in events])
+    dates = [event.get("date_start") for event in events]
+    times = map(norm_text, [event.get("time_start") for event in events])
+    locations = map(norm_text, [event.get("location") for event in events])
+    
+    return [
+        f"{title}|{date_start or ''}|{time_start}|{location}"
+        for title, date_start, time_start, location in zip(titles, dates, times, locations)
+    ]
+
 
+# Historical names for norm_text, bound directly so callers pay no extra call frame
+safe_lower = norm_text
+normalize_food_name = norm_text
@@ -19,6 +19,10 @@ from calendar_ics import ICSGenerator
 from utils import setup_logging, format_event_summary
 from schema import ParsedEvent
 
+# Characters that are unsafe in ICS filenames, mapped to underscores in one pass
+FILENAME_SANITIZE = str.maketrans({c: "_" for c in ' /\\:*?"<>|\t\n'})
+MAX_FILENAME_TITLE = 80
+
 
 def load_environment():
     """Load environment variables from .env file."""
@@ -63,19 +67,16 @@ def scan_emails(query: str, max_results: int = 10, output_ics: bool = False) ->
         parsed_events = llm_parser.parse_emails_batch(emails)
         print(f"Successfully parsed {len(parsed_events)} events")
         
-        # Post-process events
+        # Post-process events, writing each ICS file as soon as its event is ready
         print("Applying post-processing heuristics...")
-        processed_events = []
-        for event in parsed_events:
-            processed_event = PostProcessor.process_event(event)
-            processed_events.append(processed_event)
-        
-        # Generate ICS files if requested
-        if output_ics and processed_events:
+        if output_ics and parsed_events:
             print("Generating ICS files...")
-            for i, event in enumerate(processed_events):
+        processed_events = []
+        for i, event in enumerate(map(PostProcessor.process_event, parsed_events)):
+            processed_events.append(event)
+            if output_ics:
                 ics_content = ICSGenerator.generate_ics([event])
-                filename = f"event_{i+1}_{event.title.replace(' ', '_')}.ics"
+                filename = f"event_{i+1}_{event.title.translate(FILENAME_SANITIZE)[:MAX_FILENAME_TITLE]}.ics"
                 with open(filename, 'w') as f:
                     f.write(ics_content)
                 print(f"Generated: {filename}")
@@ -142,13 +143,12 @@ def main():
         sys.exit(0)
     
     # Output results
+    events_data = [event.model_dump() for event in events]
     if args.json:
         # Output as JSON
-        events_data = [event.model_dump() for event in events]
         print(json.dumps(events_data, indent=2, default=str))
     else:
         # Output formatted summary
-        events_data = [event.model_dump() for event in events]
         print(format_event_summary(events_data))
 
 
@@ -10,6 +10,26 @@ from url_utils import normalize_urls
 
 logger = logging.getLogger(__name__)
 
+# Event and location indicators for quick_event_detection, one alternation each
+EVENT_KEYWORD_RE = re.compile('|'.join(map(re.escape, [
+    'event', 'meeting', 'workshop', 'seminar', 'talk', 'lecture', 
+    'conference', 'gathering', 'session', 'presentation', 'party', 
+    'celebration', 'dinner', 'lunch', 'breakfast', 'reception', 
+    'ceremony', 'festival', 'fair', 'exhibition', 'audition', 'tryout',
+    'info session', 'kickoff', 'launch', 'orientation'
+])))
+# Any time/date indicator, as one alternation over lowercased text
+TIME_SIGNAL_RE = re.compile('|'.join((
+    r'\b\d{1,2}:\d{2}\s*(?:am|pm)\b',
+    r'\b\d{1,2}/\d{1,2}/\d{2,4}\b',
+    r'\b(?:mon|tue|wed|thu|fri|sat|sun)day\b',
+    r'\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)\w*\b',
+    r'\b(?:today|tomorrow|tonight|this week|next week)\b'
+)))
+LOCATION_KEYWORD_RE = re.compile('|'.join(map(re.escape, [
+    'location', 'where', 'room', 'hall', 'building', 'address'
+])))
+
 
 class LLMParser:
     def __init__(self, api_key: Optional[str] = None):
@@ -68,12 +88,9 @@ class LLMParser:
         # Strip exotic dashes and collapse whitespace
         for key in ['title', 'description', 'location']:
             if key in parsed_data and parsed_data[key]:
-                text = str(parsed_data[key])
-                # Replace fancy dashes
-                text = re.sub(r'[–—]', '-', text)
-                # Collapse repeated spaces
-                text = re.sub(r'\s+', ' ', text).strip()
-                parsed_data[key] = text
+                # Replace fancy dashes, then collapse repeated spaces with split/join
+                text = str(parsed_data[key]).replace('–', '-').replace('—', '-')
+                parsed_data[key] = ' '.join(text.split())
         
         return parsed_data
 
@@ -164,46 +181,22 @@ class LLMParser:
         if not email_content or len(email_content.strip()) < 100:
             return False
         
-        # Check for mailing list footers (common non-event content)
-        if len(email_content) < 200 and "mailing list" in email_content.lower():
-            return False
-        
-        # Event indicators
-        event_keywords = [
-            'event', 'meeting', 'workshop', 'seminar', 'talk', 'lecture', 
-            'conference', 'gathering', 'session', 'presentation', 'party', 
-            'celebration', 'dinner', 'lunch', 'breakfast', 'reception', 
-            'ceremony', 'festival', 'fair', 'exhibition', 'audition', 'tryout',
-            'info session', 'kickoff', 'launch', 'orientation'
-        ]
-        
-        # Time/date indicators
-        time_patterns = [
-            r'\b\d{1,2}:\d{2}\s*(am|pm|AM|PM)\b',
-            r'\b\d{1,2}/\d{1,2}/\d{2,4}\b',
-            r'\b(mon|tue|wed|thu|fri|sat|sun)day\b',
-            r'\b(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)\w*\b',
-            r'\b(today|tomorrow|tonight|this week|next week)\b'
-        ]
-        
+        # Lowercase the body once for every substring check below
         content_lower = email_content.lower()
-        subject_lower = subject.lower()
         
-        # Check for event keywords
-        has_event_keywords = any(keyword in content_lower or keyword in subject_lower 
-                               for keyword in event_keywords)
-        
-        # Check for time/date patterns
-        import re
-        has_time_patterns = any(re.search(pattern, email_content, re.IGNORECASE) 
-                              for pattern in time_patterns)
+        # Check for mailing list footers (common non-event content)
+        if len(email_content) < 200 and "mailing list" in content_lower:
+            return False
         
-        # Check for location indicators
-        location_keywords = ['location', 'where', 'room', 'hall', 'building', 'address']
-        has_location = any(keyword in content_lower for keyword in location_keywords)
+        # Check for event keywords, in the short subject first
+        if EVENT_KEYWORD_RE.search(subject.lower()) or EVENT_KEYWORD_RE.search(content_lower):
+            return True
         
-        # Must have at least event keywords OR (time patterns AND location)
-        return has_event_keywords or (has_time_patterns and has_location)
+        # Otherwise need both a time/date pattern and a location indicator
+        return (
+            TIME_SIGNAL_RE.search(content_lower) is not None
+            and LOCATION_KEYWORD_RE.search(content_lower) is not None
+        )
 
     def parse_emails_batch(self, emails: list) -> list[ParsedEvent]:
         """
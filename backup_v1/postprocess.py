@@ -1,19 +1,88 @@
 import re
 import logging
+from functools import lru_cache
 from typing import Optional, List
+from pydantic import HttpUrl
 from schema import ParsedEvent
 
 logger = logging.getLogger(__name__)
 
+# Time formats, most specific first: 12-hour with minutes, 24-hour, hour with am/pm.
+# These and the duration patterns below are matched against lowercased text.
+TIME_PATTERNS = [
+    re.compile(r'(\d{1,2}):(\d{2})\s*(am|pm)'),
+    re.compile(r'(\d{1,2}):(\d{2})'),
+    re.compile(r'(\d{1,2})\s*(am|pm)'),
+]
+
+# Duration hints used to infer an end time, tagged with the kind of match
+DURATION_PATTERNS = [
+    (re.compile(r'(\d+)\s*hours?'), 'hours'),
+    (re.compile(r'(\d+)\s*hrs?'), 'hours'),
+    (re.compile(r'(\d+)\s*minutes?'), 'minutes'),
+    (re.compile(r'(\d+)\s*mins?'), 'minutes'),
+    (re.compile(r'(\d+)-(\d+)'), 'range'),  # Time range like "5-6 PM"
+]
+
+# All duration hints in one pass, to reject descriptions without any cheaply
+DURATION_ANY_RE = re.compile(
+    '|'.join(f'(?:{pattern.pattern})' for pattern, _ in DURATION_PATTERNS)
+)
+
+WHITESPACE_RE = re.compile(r'\s+')
+LOCATION_PREFIX_RE = re.compile(r'^(location|venue):\s*', re.IGNORECASE)
+TRAILING_PARENS_RE = re.compile(r'\s*\(.*?\)$')
+
+# Known food vendors/brands, in priority order
+FOOD_VENDORS = (
+    'bonchon', 'pizza', 'sushi', 'chinese', 'indian', 'mexican', 
+    'italian', 'thai', 'korean', 'japanese', 'mediterranean',
+    'subway', 'chipotle', 'panera', 'starbucks', 'dunkin'
+)
+FOOD_VENDOR_RE = re.compile('|'.join(FOOD_VENDORS))
+
+# Generic food mentions, as one alternation (matched against lowercased descriptions)
+GENERIC_FOOD_RE = re.compile('|'.join((
+    r'dinner\s+provided',
+    r'lunch\s+provided',
+    r'breakfast\s+provided',
+    r'food\s+provided',
+    r'refreshments\s+provided',
+    r'catered\s+by',
+    r'catering\s+by',
+    r'light\s+snacks',
+    r'limited\s+snacks',
+)))
+
+# Quantity hints, in priority order (matched against lowercased descriptions)
+QUANTITY_PATTERNS = [re.compile(p) for p in (
+    r'dinner\s+provided',
+    r'lunch\s+provided',
+    r'light\s+snacks',
+    r'heavy\s+snacks',
+    r'refreshments\s+provided',
+    r'limited\s+snacks',
+    r'while\s+supplies\s+last',
+    r'first\s+come\s+first\s+served',
+)]
+
+URL_RE = re.compile(r'https?://[^\s<>"{}|\\^`\[\]]+')
+# Registration/signup links are listed ahead of other URLs
+PRIORITY_URL_RE = re.compile(r'eventbrite|google\.com/forms|forms\.gle|signup|register|rsvp', re.IGNORECASE)
+
 
 class PostProcessor:
     """Post-processing heuristics for improving parsed event data."""
     
     @staticmethod
+    @lru_cache(maxsize=4096)
     def normalize_time(time_str: Optional[str]) -> Optional[str]:
         """
         Normalize time string to HH:MM format.
         
+        Results are memoized, since the same phrasings ("7:00 PM", "6pm")
+        recur across events.
+        
         Args:
             time_str: Time string in various formats
             
@@ -26,15 +95,16 @@ class PostProcessor:
         # Remove extra whitespace
         time_str = time_str.strip()
         
-        # Handle various time formats
-        patterns = [
-            r'(\d{1,2}):(\d{2})\s*(am|pm|AM|PM)',  # 12-hour format
-            r'(\d{1,2}):(\d{2})',  # 24-hour format
-            r'(\d{1,2})\s*(am|pm|AM|PM)',  # Hour only with am/pm
-        ]
+        # Fast path: the schema already requires HH:MM, so most values need no regex
+        if len(time_str) == 5 and time_str[2] == ':' and time_str.isascii():
+            hour, minute = time_str[:2], time_str[3:]
+            if hour.isdigit() and minute.isdigit():
+                return time_str if int(hour) <= 23 and int(minute) <= 59 else None
         
-        for pattern in patterns:
-            match = re.search(pattern, time_str, re.IGNORECASE)
+        # Handle various time formats
+        time_lower = time_str.lower()
+        for pattern in TIME_PATTERNS:
+            match = pattern.search(time_lower)
             if match:
                 groups = match.groups()
                 hour = int(groups[0])
@@ -47,15 +117,15 @@ class PostProcessor:
                 
                 # Check if we have AM/PM (patterns 1 and 3 have AM/PM)
                 am_pm = None
-                if len(groups) >= 3 and groups[2] in ['am', 'pm', 'AM', 'PM']:
+                if len(groups) >= 3 and groups[2] in ('am', 'pm'):
                     am_pm = groups[2]
-                elif len(groups) >= 2 and groups[1] in ['am', 'pm', 'AM', 'PM']:
+                elif len(groups) >= 2 and groups[1] in ('am', 'pm'):
                     am_pm = groups[1]
                 
                 # Convert to 24-hour format
-                if am_pm and am_pm.lower() == 'pm' and hour != 12:
+                if am_pm == 'pm' and hour != 12:
                     hour += 12
-                elif am_pm and am_pm.lower() == 'am' and hour == 12:
+                elif am_pm == 'am' and hour == 12:
                     hour = 0
                 
                 # Validate hour and minute ranges
@@ -79,19 +149,16 @@ class PostProcessor:
         if not start_time or not description:
             return None
             
-        # Look for duration patterns
-        duration_patterns = [
-            r'(\d+)\s*hours?',
-            r'(\d+)\s*hrs?',
-            r'(\d+)\s*minutes?',
-            r'(\d+)\s*mins?',
-            r'(\d+)-(\d+)',  # Time range like "5-6 PM"
-        ]
+        # Most descriptions carry no duration; one sweep rules that out
+        description_lower = description.lower()
+        if not DURATION_ANY_RE.search(description_lower):
+            return None
         
-        for pattern in duration_patterns:
-            match = re.search(pattern, description, re.IGNORECASE)
+        # Look for duration patterns, in priority order
+        for pattern, kind in DURATION_PATTERNS:
+            match = pattern.search(description_lower)
             if match:
-                if '-' in pattern:  # Time range
+                if kind == 'range':  # Time range
                     try:
                         start_hour = int(match.group(1))
                         end_hour = int(match.group(2))
@@ -104,12 +171,12 @@ class PostProcessor:
                 else:  # Duration
                     try:
                         duration = int(match.group(1))
-                        if 'hour' in pattern or 'hr' in pattern:
+                        if kind == 'hours':
                             # Add hours to start time
                             start_hour, start_minute = map(int, start_time.split(':'))
                             end_hour = (start_hour + duration) % 24
                             return f"{end_hour:02d}:{start_minute:02d}"
-                        elif 'minute' in pattern or 'min' in pattern:
+                        elif kind == 'minutes':
                             # Add minutes to start time
                             start_hour, start_minute = map(int, start_time.split(':'))
                             total_minutes = start_hour * 60 + start_minute + duration
@@ -136,11 +203,15 @@ class PostProcessor:
             return None
             
         # Remove extra whitespace and normalize
-        location = re.sub(r'\s+', ' ', location.strip())
+        location = WHITESPACE_RE.sub(' ', location.strip())
         
-        # Remove common prefixes/suffixes that don't add value
-        location = re.sub(r'^(location|venue):\s*', '', location, flags=re.IGNORECASE)
-        location = re.sub(r'\s*\(.*?\)$', '', location)  # Remove trailing parenthetical info
+        # Remove common prefixes/suffixes that don't add value; cheap string
+        # checks decide whether either regex can match at all (non-ASCII text
+        # always takes the regex, which also folds e.g. a dotless i)
+        if not location.isascii() or location[:9].lower().startswith(('location:', 'venue:')):
+            location = LOCATION_PREFIX_RE.sub('', location)
+        if location.endswith(')'):
+            location = TRAILING_PARENS_RE.sub('', location)  # Remove trailing parenthetical info
         
         return location if location else None
 
@@ -160,55 +231,24 @@ class PostProcessor:
             
         description_lower = description.lower()
         
-        # Known food vendors/brands
-        food_vendors = [
-            'bonchon', 'pizza', 'sushi', 'chinese', 'indian', 'mexican', 
-            'italian', 'thai', 'korean', 'japanese', 'mediterranean',
-            'subway', 'chipotle', 'panera', 'starbucks', 'dunkin'
-        ]
-        
         food_type = None
         quantity_hint = None
         
-        # Check for specific vendors
-        for vendor in food_vendors:
-            if vendor in description_lower:
-                food_type = vendor.title()
-                break
+        # Check for specific vendors: one sweep finds whether any appears, and
+        # only then does list order pick which one wins
+        if FOOD_VENDOR_RE.search(description_lower):
+            for vendor in FOOD_VENDORS:
+                if vendor in description_lower:
+                    food_type = vendor.title()
+                    break
         
         # If no specific vendor found, check for generic food mentions
-        if not food_type:
-            generic_food_patterns = [
-                r'dinner\s+provided',
-                r'lunch\s+provided',
-                r'breakfast\s+provided',
-                r'food\s+provided',
-                r'refreshments\s+provided',
-                r'catered\s+by',
-                r'catering\s+by',
-                r'light\s+snacks',
-                r'limited\s+snacks',
-            ]
-            
-            for pattern in generic_food_patterns:
-                if re.search(pattern, description_lower):
-                    food_type = "Catered"
-                    break
+        if not food_type and GENERIC_FOOD_RE.search(description_lower):
+            food_type = "Catered"
         
         # Extract quantity hints
-        quantity_patterns = [
-            r'dinner\s+provided',
-            r'lunch\s+provided',
-            r'light\s+snacks',
-            r'heavy\s+snacks',
-            r'refreshments\s+provided',
-            r'limited\s+snacks',
-            r'while\s+supplies\s+last',
-            r'first\s+come\s+first\s+served',
-        ]
-        
-        for pattern in quantity_patterns:
-            match = re.search(pattern, description_lower)
+        for pattern in QUANTITY_PATTERNS:
+            match = pattern.search(description_lower)
             if match:
                 quantity_hint = match.group(0)
                 break
@@ -224,11 +264,19 @@ class PostProcessor:
             text: Text to search for URLs
             
         Returns:
-            List of found URLs
+            List of found URLs, registration links first, duplicates removed
         """
-        url_pattern = r'https?://[^\s<>"{}|\\^`\[\]]+'
-        urls = re.findall(url_pattern, text)
-        return list(set(urls))  # Remove duplicates
+        priority_urls = {}
+        other_urls = {}
+        for match in URL_RE.finditer(text):
+            url = match.group()
+            if url in priority_urls or url in other_urls:
+                continue
+            if PRIORITY_URL_RE.search(url):
+                priority_urls[url] = None
+            else:
+                other_urls[url] = None
+        return [*priority_urls, *other_urls]
 
     @classmethod
     def process_event(cls, event: ParsedEvent) -> ParsedEvent:
@@ -266,11 +314,13 @@ class PostProcessor:
         # Extract additional URLs from description
         if event.description:
             additional_urls = cls.extract_urls(event.description)
+            # Only URLs not already on the event pay for HttpUrl validation
+            known_urls = {str(u) for u in event.urls}
             for url in additional_urls:
-                if url not in [str(u) for u in event.urls]:
+                if url not in known_urls:
                     try:
-                        from pydantic import HttpUrl
                         event.urls.append(HttpUrl(url))
+                        known_urls.add(url)
                     except Exception:
                         logger.warning(f"Invalid URL found: {url}")
         
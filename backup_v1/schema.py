@@ -3,6 +3,10 @@ from typing import Optional, List
 import re
 
 
+DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+TIME_RE = re.compile(r"\d{2}:\d{2}")
+
+
 class Contact(BaseModel):
     name: Optional[str] = None
     email: Optional[str] = None
@@ -32,7 +36,7 @@ class ParsedEvent(BaseModel):
     @classmethod
     def _date_fmt(cls, v: str) -> str:
         # enforce YYYY-MM-DD
-        if not re.fullmatch(r"\d{4}-\d{2}-\d{2}", v or ""):
+        if not DATE_RE.fullmatch(v or ""):
             raise ValueError("date_start must be YYYY-MM-DD")
         return v
 
@@ -41,6 +45,6 @@ class ParsedEvent(BaseModel):
     def _time_fmt(cls, v: Optional[str]) -> Optional[str]:
         if v is None: 
             return v
-        if not re.fullmatch(r"\d{2}:\d{2}", v):
+        if not TIME_RE.fullmatch(v):
             raise ValueError("time must be HH:MM 24h")
         return v
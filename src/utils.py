@@ -2,7 +2,30 @@ import hashlib
 import logging
 import re
 from typing import Any, Dict, Optional
-import json
+
+
+# [XXXXX] tag at the start of a subject, after any leading whitespace
+MAILING_LIST_RE = re.compile(r'\s*\[([^\]]+)\]')
+
+# ANSI color codes for CLI output
+RED = '\033[91m'
+GREEN = '\033[92m'
+YELLOW = '\033[93m'
+BLUE = '\033[94m'
+MAGENTA = '\033[95m'
+CYAN = '\033[96m'
+WHITE = '\033[97m'
+BOLD = '\033[1m'
+END = '\033[0m'
+
+# Fixed leading lines of highlight_event_fields: title (bold, white), when
+# (green), where (blue) and organizer (yellow)
+HIGHLIGHT_HEADER = (
+    f"{BOLD}{WHITE}Title:{END} {{title}}\n"
+    f"{GREEN}When:{END} {{date}} at {{time_str}}\n"
+    f"{BLUE}Where:{END} {{location}}\n"
+    f"{YELLOW}Organizer:{END} {{organizer}}"
+)
 
 
 def setup_logging(level: str = "INFO") -> None:
@@ -24,17 +47,14 @@ def generate_dedupe_hash(event_data: Dict[str, Any]) -> str:
         Returns:
             SHA256 hash string
     """
-    # Create a normalized version for hashing
-    normalized = {
-        'title': event_data.get('title', '').lower().strip(),
-        'date_start': event_data.get('date_start', ''),
-        'time_start': event_data.get('time_start', ''),
-        'location': event_data.get('location', '').lower().strip() if event_data.get('location') else '',
-    }
-    
-    # Convert to JSON string and hash
-    json_str = json.dumps(normalized, sort_keys=True)
-    return hashlib.sha256(json_str.encode()).hexdigest()
+    # Fixed field order joined by a unit separator, so no JSON encoding is needed
+    fields = (
+        (event_data.get('title') or '').lower().strip(),
+        event_data.get('date_start') or '',
+        event_data.get('time_start') or '',
+        (event_data.get('location') or '').lower().strip(),
+    )
+    return hashlib.sha256("\x1f".join(fields).encode()).hexdigest()
 
 
 def highlight_event_fields(event_data: Dict[str, Any]) -> str:
@@ -47,39 +67,20 @@ def highlight_event_fields(event_data: Dict[str, Any]) -> str:
         Returns:
             Formatted string with highlighted fields
     """
-    # ANSI color codes
-    RED = '\033[91m'
-    GREEN = '\033[92m'
-    YELLOW = '\033[93m'
-    BLUE = '\033[94m'
-    MAGENTA = '\033[95m'
-    CYAN = '\033[96m'
-    WHITE = '\033[97m'
-    BOLD = '\033[1m'
-    END = '\033[0m'
-    
-    lines = []
-    
-    # Title (bold, white)
-    title = event_data.get('title', 'No title')
-    lines.append(f"{BOLD}{WHITE}Title:{END} {title}")
-    
-    # Date and time (green)
-    date = event_data.get('date_start', 'No date')
-    time_start = event_data.get('time_start', 'No start time')
+    # Date and time
+    time_str = f"{event_data.get('time_start', 'No start time')}"
     time_end = event_data.get('time_end', '')
-    time_str = f"{time_start}"
     if time_end:
         time_str += f" - {time_end}"
-    lines.append(f"{GREEN}When:{END} {date} at {time_str}")
     
-    # Location (blue)
-    location = event_data.get('location', 'No location')
-    lines.append(f"{BLUE}Where:{END} {location}")
-    
-    # Organizer (yellow)
-    organizer = event_data.get('organizer', 'No organizer')
-    lines.append(f"{YELLOW}Organizer:{END} {organizer}")
+    # Title, when, where and organizer always print, via one precompiled template
+    lines = [HIGHLIGHT_HEADER.format(
+        title=event_data.get('title', 'No title'),
+        date=event_data.get('date_start', 'No date'),
+        time_str=time_str,
+        location=event_data.get('location', 'No location'),
+        organizer=event_data.get('organizer', 'No organizer')
+    )]
     
     # Food info (magenta)
     food_type = event_data.get('food_type')
@@ -121,11 +122,8 @@ def extract_mailing_list_from_subject(subject: str) -> Optional[str]:
         return None
     
     # Match [XXXXX] at the beginning of the subject
-    match = re.match(r'^\[([^\]]+)\]', subject.strip())
-    if match:
-        return match.group(1)
-    
-    return None
+    match = MAILING_LIST_RE.match(subject)
+    return match.group(1) if match else None
 
 
 def format_event_summary(events: list) -> str: